@@ -6,17 +6,36 @@ from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import Platform
+from homeassistant.helpers import device_registry as dr
 
-from .igrill import DEVICE_TYPES
+from .api import async_register_websocket_commands
+from .catalog import EntityCatalog
+from .igrill import DEVICE_TYPES, IDevicePeripheral
+from .connection import ConnectionSupervisor
+from .coordinator import IGrillCoordinator
+from .exporter import Exporter, sink_from_target
+from .throttle import PublishPolicy
 from .const import (
     DOMAIN,
+    CONF_AVAILABILITY_GRACE,
+    CONF_CAPABILITIES,
+    CONF_EXPORT_TARGET,
+    CONF_LOW_DUTY,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_POLL_INTERVAL,
     CONF_SENSORTYPE,
-)
-from homeassistant.components.bluetooth.match import (
-    BluetoothCallbackMatcher,
+    CONF_TEMP_DEADBAND,
+    DATA_CATALOGS,
+    DATA_COORDINATOR,
+    DATA_EXPORTERS,
+    DEFAULT_AVAILABILITY_GRACE,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    EVENT_PROBE_THRESHOLD,
 )
 
-PLATFORMS: list[str] = [Platform.SENSOR]
+PLATFORMS: list[str] = [Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -26,33 +45,119 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     assert address is not None
     sensor_type = entry.data[CONF_SENSORTYPE]
     data = DEVICE_TYPES[sensor_type]()
+    data.load_capabilities(entry.data.get(CONF_CAPABILITIES))
+    _apply_options(data, entry)
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[entry.entry_id] = data
+    domain_data.setdefault(DATA_CATALOGS, {})[entry.entry_id] = EntityCatalog(
+        data, address, entry.title
+    )
+    if (coordinator := domain_data.get(DATA_COORDINATOR)) is None:
+        coordinator = domain_data[DATA_COORDINATOR] = IGrillCoordinator(hass)
+    async_register_websocket_commands(hass)
+    low_duty_interval = _low_duty_interval(entry)
+    supervisor = ConnectionSupervisor(
+        data, scheduler=coordinator.scheduler, low_duty_interval=low_duty_interval
+    )
+
+    @callback
+    def _async_save_capabilities(capabilities: dict) -> None:
+        """Persist the discovered capabilities so reconnects can skip discovery."""
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_CAPABILITIES: capabilities}
+        )
+        # The catalog's device info is built before the firmware is known
+        device_registry = dr.async_get(hass)
+        if device := device_registry.async_get_device({(DOMAIN, address)}):
+            device_registry.async_update_device(
+                device.id, sw_version=capabilities["firmware"]
+            )
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = data
+    entry.async_on_unload(data.async_add_capabilities_listener(_async_save_capabilities))
 
     @callback
-    def _async_update_ble(
-        service_info: bluetooth.BluetoothServiceInfoBleak,
-        change: bluetooth.BluetoothChange,
-    ) -> None:
-        """Update from a ble callback."""
-        hass.async_create_task(data.async_init(service_info.device))
+    def _async_fire_threshold(key: str, value: float, threshold: float, reached: bool) -> None:
+        """Fire threshold crossings straight onto the bus as they are received."""
+        hass.bus.async_fire(
+            EVENT_PROBE_THRESHOLD,
+            {
+                "address": address,
+                "name": entry.title,
+                "probe": key,
+                "temperature": value,
+                "threshold": threshold,
+                "type": "reached" if reached else "cleared",
+            },
+        )
+
+    entry.async_on_unload(data.async_add_threshold_listener(_async_fire_threshold))
+
+    export_target = entry.options.get(CONF_EXPORT_TARGET)
+    if export_target:
+        exporter = Exporter(
+            sink_from_target(hass, export_target),
+            {"address": address, "model": data.name},
+        )
+        domain_data.setdefault(DATA_EXPORTERS, {})[entry.entry_id] = exporter
+        entry.async_on_unload(data.async_add_values_listener(exporter.async_values))
+        exporter.async_start()
+
+    async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        if (
+            _low_duty_interval(entry) != low_duty_interval
+            or entry.options.get(CONF_EXPORT_TARGET) != export_target
+        ):
+            # The connection mode also decides how the device is scanned for
+            await hass.config_entries.async_reload(entry.entry_id)
+        else:
+            _apply_options(data, entry)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(
-        bluetooth.async_register_callback(
-            hass,
-            _async_update_ble,
-            BluetoothCallbackMatcher(address=address),
-            bluetooth.BluetoothScanningMode.ACTIVE,
+        coordinator.async_add_device(
+            address,
+            supervisor,
+            bluetooth.BluetoothScanningMode.ACTIVE
+            if low_duty_interval is None
+            else bluetooth.BluetoothScanningMode.PASSIVE,
         )
     )  # only start after all platforms have had a chance to subscribe
+    entry.async_on_unload(supervisor.async_stop)
     return True
 
 
+def _apply_options(data: IDevicePeripheral, entry: ConfigEntry) -> None:
+    """Apply the publish policy and availability options to a device."""
+    data.availability_grace = entry.options.get(
+        CONF_AVAILABILITY_GRACE, DEFAULT_AVAILABILITY_GRACE
+    )
+    data.set_temperature_policy(
+        PublishPolicy(
+            deadband=entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+            min_interval=entry.options.get(
+                CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+            ),
+        )
+    )
+
+
+def _low_duty_interval(entry: ConfigEntry) -> float | None:
+    """The longest interval between polls, or None to hold a connection open."""
+    if not entry.options.get(CONF_LOW_DUTY, False):
+        return None
+    return entry.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     await hass.data[DOMAIN][entry.entry_id].close()
+    if exporter := hass.data[DOMAIN].get(DATA_EXPORTERS, {}).pop(entry.entry_id, None):
+        await exporter.async_stop()
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN][DATA_CATALOGS].pop(entry.entry_id)
 
     return unload_ok
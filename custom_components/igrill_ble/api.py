@@ -0,0 +1,54 @@
+"""Websocket commands for the igrill integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_WEBSOCKET_REGISTERED, DOMAIN
+from .igrill import IDevicePeripheral
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands once for all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if domain_data.get(DATA_WEBSOCKET_REGISTERED):
+        return
+    domain_data[DATA_WEBSOCKET_REGISTERED] = True
+    websocket_api.async_register_command(hass, websocket_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entry_id"): str,
+        vol.Required("key"): str,
+        vol.Optional("start"): vol.Coerce(float),
+        vol.Optional("end"): vol.Coerce(float),
+        vol.Optional("buckets", default=100): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+    }
+)
+@callback
+def websocket_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a sensor's downsampled history, as min/max/mean per time bucket."""
+    igrill: IDevicePeripheral | None = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not isinstance(igrill, IDevicePeripheral):
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Unknown entry")
+        return
+    connection.send_result(
+        msg["id"],
+        {
+            "key": msg["key"],
+            "buckets": igrill.history.query(
+                msg["key"], msg.get("start"), msg.get("end"), msg["buckets"]
+            ),
+        },
+    )
@@ -0,0 +1,166 @@
+"""Entity descriptions, names and ids of a device, built once per config entry."""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from homeassistant.components.bluetooth.passive_update_processor import (
+    PassiveBluetoothEntityKey,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ATTR_IDENTIFIERS,
+    ATTR_MANUFACTURER,
+    ATTR_MODEL,
+    ATTR_NAME,
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    TEMP_CELSIUS,
+    TEMP_FAHRENHEIT,
+    TIME_MINUTES,
+)
+from homeassistant.helpers.entity import DeviceInfo
+from sensor_state_data import DeviceClass, Units
+from sensor_state_data.description import BaseSensorDescription
+
+from .const import DOMAIN
+from .igrill import IDevicePeripheral
+
+SENSOR_DESCRIPTIONS = {
+    (DeviceClass.TEMPERATURE, Units.TEMP_FAHRENHEIT): SensorEntityDescription(
+        key=f"{DeviceClass.TEMPERATURE}_{Units.TEMP_CELSIUS}",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=TEMP_FAHRENHEIT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    (DeviceClass.TEMPERATURE, Units.TEMP_CELSIUS): SensorEntityDescription(
+        key=f"{DeviceClass.TEMPERATURE}_{Units.TEMP_CELSIUS}",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    (DeviceClass.BATTERY, Units.PERCENTAGE): SensorEntityDescription(
+        key=f"{DeviceClass.BATTERY}_{Units.PERCENTAGE}",
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    (
+        DeviceClass.SIGNAL_STRENGTH,
+        Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    ): SensorEntityDescription(
+        key=f"{DeviceClass.SIGNAL_STRENGTH}_{Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT}",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    (DeviceClass.GAS, Units.PERCENTAGE): SensorEntityDescription(
+        key=f"{DeviceClass.GAS}_{Units.PERCENTAGE}",
+        device_class=DeviceClass.GAS,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    (None, Units.PERCENTAGE): SensorEntityDescription(
+        key=str(Units.PERCENTAGE),
+        device_class=None,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+}
+
+
+def prediction_descriptions(probe_key: str) -> tuple[SensorEntityDescription, ...]:
+    """Descriptions of the ETA and heating rate sensors of a probe."""
+    title = key_name(probe_key)
+    return (
+        SensorEntityDescription(
+            key=f"{probe_key}_eta",
+            name=f"{title} ETA",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=TIME_MINUTES,
+        ),
+        SensorEntityDescription(
+            key=f"{probe_key}_rate",
+            name=f"{title} rate",
+            native_unit_of_measurement=f"{TEMP_CELSIUS}/{TIME_MINUTES}",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    )
+
+
+def key_name(key: str) -> str:
+    return key.replace("_", " ").title()
+
+
+class CatalogEntry(NamedTuple):
+    """What a single sensor entity is created from."""
+
+    entity_key: PassiveBluetoothEntityKey
+    description: SensorEntityDescription
+    name: str
+    unique_id: str
+
+
+class EntityCatalog:
+    """
+    The entities of one device. Descriptions are shared between devices, and the
+    device info is a single object shared by all of the device's entities, so
+    creating an entity only has to look its entry up.
+    """
+
+    def __init__(self, igrill: IDevicePeripheral, address: str, name: str) -> None:
+        self.address = address
+        self.device_info = DeviceInfo(
+            {
+                ATTR_IDENTIFIERS: {(DOMAIN, address)},
+                ATTR_NAME: name,
+                ATTR_MANUFACTURER: "Weber",
+                ATTR_MODEL: igrill.name,
+            }
+        )
+        self.probes = tuple(igrill.predictors)
+        capabilities = igrill.capabilities
+        self.heating_element = (
+            capabilities["heating_element"]
+            if capabilities
+            else igrill.has_heating_element
+        )
+        self.led_knob = (
+            capabilities["led_knob"] if capabilities else igrill.has_led_knob_light
+        )
+        self.sensors: dict[str, CatalogEntry] = {}
+        for key, description in igrill.sensor_descriptions():
+            self.add_sensor(key, description)
+        self.predictions = tuple(
+            CatalogEntry(
+                PassiveBluetoothEntityKey(description.key, None),
+                description,
+                description.name,
+                self.unique_id(description.key),
+            )
+            for probe_key in self.probes
+            for description in prediction_descriptions(probe_key)
+        )
+
+    def unique_id(self, key: str) -> str:
+        return f"{self.address}-{key}"
+
+    def add_sensor(
+        self, key: str, description: BaseSensorDescription
+    ) -> CatalogEntry | None:
+        """Add a sensor reported by the device, unless it is unknown or unitless."""
+        entry = self.sensors.get(key)
+        if entry is None and description.native_unit_of_measurement:
+            entry = self.sensors[key] = CatalogEntry(
+                PassiveBluetoothEntityKey(key, None),
+                SENSOR_DESCRIPTIONS[
+                    (description.device_class, description.native_unit_of_measurement)
+                ],
+                key_name(key),
+                self.unique_id(key),
+            )
+        return entry
@@ -0,0 +1,338 @@
+"""
+Standalone daemon monitoring grills without Home Assistant, streaming their readings
+as lines of JSON to stdout or to the clients of a TCP socket.
+
+    python custom_components/igrill_ble/cli.py [--address ADDRESS[=TYPE] ...]
+        [--listen [HOST:]PORT] [--low-duty SECONDS]
+
+Without addresses every grill found while scanning is monitored. With --simulate
+simulated grills are monitored instead, e.g. to develop a consumer of the stream.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import types
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if not __package__:
+    # Run as a script: load the modules without the package's __init__, which sets
+    # up the integration and needs Home Assistant
+    _DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+    if sys.path and os.path.abspath(sys.path[0]) == _DIRECTORY:
+        # Keep the modules from shadowing top level ones of the same name
+        del sys.path[0]
+    _PACKAGE = types.ModuleType("igrill_ble")
+    _PACKAGE.__path__ = [_DIRECTORY]
+    sys.modules["igrill_ble"] = _PACKAGE
+    __package__ = "igrill_ble"
+
+from .connection import ConnectionScheduler, ConnectionSupervisor
+from .const import SIMULATED_ADVERTISEMENT_INTERVAL, STREAM_BUFFER_LIMIT
+from .core import EntityKey
+from .discovery import get_device_type
+from .igrill import DEVICE_TYPES
+
+if TYPE_CHECKING:
+    from bleak_retry_connector import BLEDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StdoutStream:
+    """Writes the stream to stdout, a line at a time."""
+
+    def write(self, line: bytes) -> None:
+        sys.stdout.buffer.write(line)
+        sys.stdout.buffer.flush()
+
+    async def async_close(self) -> None:
+        """Nothing to release, stdout stays open."""
+
+
+class SocketStream:
+    """
+    Serves the stream over TCP, each client receiving the lines written after it
+    connected. Clients too far behind are dropped instead of buffered without bound.
+    """
+
+    def __init__(self, host: str | None, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+        # Connected clients and the task serving each
+        self._clients: dict[asyncio.StreamWriter, asyncio.Task] = {}
+
+    async def async_start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._async_client, self.host, self.port
+        )
+
+    async def _async_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._clients[writer] = asyncio.current_task()
+        try:
+            # Nothing is read from clients, this only waits for them to hang up
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    def write(self, line: bytes) -> None:
+        for writer in self._clients:
+            if writer.is_closing():
+                # Dropped, waiting for its task to notice
+                continue
+            if writer.transport.get_write_buffer_size() > STREAM_BUFFER_LIMIT:
+                _LOGGER.warning(
+                    "Dropping %s, too far behind", writer.get_extra_info("peername")
+                )
+                # Closing would wait for the backlog to be sent first
+                writer.transport.abort()
+            else:
+                writer.write(line)
+
+    async def async_close(self) -> None:
+        for writer in self._clients:
+            if writer.transport.get_write_buffer_size():
+                writer.transport.abort()
+            else:
+                writer.close()
+        # Their tasks finish once the closes are seen, rather than being cancelled
+        await asyncio.gather(*self._clients.values(), return_exceptions=True)
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+class Daemon:
+    """
+    Monitors grills, each connected by a ConnectionSupervisor fed with advertisements
+    as in Home Assistant, and writes every batch of changed values to the stream.
+
+    Records carry the time, address and event: "added" with the model when a grill is
+    first seen, "values" with the changed values by key, and "disconnected".
+    """
+
+    def __init__(
+        self,
+        stream: StdoutStream | SocketStream,
+        addresses: dict[str, str | None] | None = None,
+        low_duty_interval: float | None = None,
+    ) -> None:
+        self.stream = stream
+        # Addresses to monitor, with their type if not resolved from the advertised name
+        self.addresses = addresses
+        self.low_duty_interval = low_duty_interval
+        self.scheduler = ConnectionScheduler()
+        self.supervisors: dict[str, ConnectionSupervisor] = {}
+        self._remove_listeners: list[Callable[[], None]] = []
+
+    def emit(self, address: str, event: str, **fields: Any) -> None:
+        record = {"time": round(time.time(), 3), "address": address, "event": event}
+        record.update(fields)
+        self.stream.write(
+            json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        )
+
+    def add_device(self, address: str, sensor_type: str) -> ConnectionSupervisor:
+        peripheral = DEVICE_TYPES[sensor_type]()
+        supervisor = ConnectionSupervisor(
+            peripheral,
+            scheduler=self.scheduler,
+            low_duty_interval=self.low_duty_interval,
+        )
+        self.supervisors[address] = supervisor
+
+        def values(changed: dict[EntityKey, Any]) -> None:
+            self.emit(
+                address,
+                "values",
+                values={entity_key.key: value for entity_key, value in changed.items()},
+            )
+
+        self._remove_listeners += [
+            peripheral.async_add_values_listener(values),
+            peripheral.async_add_disconnect_listener(
+                lambda: self.emit(address, "disconnected")
+            ),
+        ]
+        self.emit(address, "added", model=sensor_type, name=peripheral.name)
+        return supervisor
+
+    def advertisement(
+        self, ble_device: BLEDevice, name: str | None, rssi: float | None
+    ) -> None:
+        """Route an advertisement to its grill, adding grills on their first one."""
+        address = ble_device.address.upper()
+        supervisor = self.supervisors.get(address)
+        if supervisor is None:
+            if self.addresses is not None and address not in self.addresses:
+                return
+            sensor_type = self.addresses and self.addresses[address]
+            if not sensor_type:
+                if (resolved := get_device_type(name)) is None:
+                    return
+                sensor_type = resolved.value
+            supervisor = self.add_device(address, sensor_type)
+        supervisor.async_advertisement(ble_device, None, rssi)
+
+    async def async_stop(self) -> None:
+        for remove_listener in self._remove_listeners:
+            remove_listener()
+        self._remove_listeners.clear()
+        for supervisor in self.supervisors.values():
+            supervisor.async_stop()
+            await supervisor.peripheral.close()
+
+
+async def async_scan(daemon: Daemon, stop: asyncio.Event) -> None:
+    """Feed the daemon with bluetooth advertisements until stopped."""
+    from bleak import BleakScanner
+
+    def detected(ble_device, advertisement) -> None:
+        daemon.advertisement(
+            ble_device, advertisement.local_name or ble_device.name, advertisement.rssi
+        )
+
+    async with BleakScanner(detection_callback=detected):
+        await stop.wait()
+
+
+async def async_simulate(
+    daemon: Daemon,
+    sensor_types: list[str],
+    stop: asyncio.Event,
+    session: str | None = None,
+    speed: float = 1.0,
+) -> None:
+    """Feed the daemon with advertisements of simulated grills until stopped."""
+    from bleak.backends.device import BLEDevice
+
+    from .simulator import SimulatedIGrill, load_session
+
+    grills = []
+    for number, sensor_type in enumerate(sensor_types, start=1):
+        address = f"70:91:8F:00:00:{number:02X}"
+        supervisor = daemon.add_device(address, sensor_type)
+        simulator = SimulatedIGrill.for_peripheral(
+            supervisor.peripheral, address=address
+        )
+        supervisor.peripheral.client_class = simulator.client_class
+        grills.append((simulator, BLEDevice(address, simulator.name, None)))
+    records = load_session(session) if session else []
+    replays = [
+        asyncio.create_task(simulator.async_replay(records, speed))
+        for simulator, _ in grills
+    ]
+    try:
+        while not stop.is_set():
+            for simulator, ble_device in grills:
+                daemon.advertisement(ble_device, simulator.name, -60)
+            try:
+                await asyncio.wait_for(stop.wait(), SIMULATED_ADVERTISEMENT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        for replay in replays:
+            replay.cancel()
+
+
+def parse_address(value: str) -> tuple[str, str | None]:
+    """Parse an ADDRESS[=TYPE] argument."""
+    address, _, sensor_type = value.partition("=")
+    if sensor_type and sensor_type not in DEVICE_TYPES:
+        raise argparse.ArgumentTypeError(f"unknown type {sensor_type}")
+    return address.upper(), sensor_type or None
+
+
+async def async_main(
+    args: argparse.Namespace, stop: asyncio.Event | None = None
+) -> None:
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows, nor outside the main thread
+            pass
+    if args.listen:
+        host, _, port = args.listen.rpartition(":")
+        stream = SocketStream(host or None, int(port))
+        await stream.async_start()
+    else:
+        stream = StdoutStream()
+    daemon = Daemon(
+        stream, dict(args.address) if args.address else None, args.low_duty
+    )
+    try:
+        if args.simulate:
+            await async_simulate(daemon, args.simulate, stop, args.replay, args.speed)
+        else:
+            await async_scan(daemon, stop)
+    finally:
+        await daemon.async_stop()
+        await stream.async_close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Monitor Weber iGrill and Pulse grills, streaming their readings as JSON lines."
+    )
+    parser.add_argument(
+        "--address",
+        action="append",
+        type=parse_address,
+        metavar="ADDRESS[=TYPE]",
+        help="only monitor this grill, with its type if its name isn't advertised",
+    )
+    parser.add_argument(
+        "--listen",
+        metavar="[HOST:]PORT",
+        help="stream to clients of this TCP socket instead of stdout",
+    )
+    parser.add_argument(
+        "--low-duty",
+        type=float,
+        metavar="SECONDS",
+        help="poll at most this often instead of staying connected",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="append",
+        choices=sorted(DEVICE_TYPES),
+        metavar="TYPE",
+        help="monitor a simulated grill of this type instead of scanning",
+    )
+    parser.add_argument(
+        "--replay", metavar="SESSION", help="recorded cook the simulated grills play"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="playback speed of --replay"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING, stream=sys.stderr
+    )
+    try:
+        asyncio.run(async_main(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,14 +12,38 @@ from homeassistant.components.bluetooth import (
     BluetoothServiceInfo,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import (
+    SOURCE_INTEGRATION_DISCOVERY,
+    ConfigEntry,
+    ConfigFlow,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import SensorType, DOMAIN, CONF_SENSORTYPE
+from .const import (
+    SensorType,
+    DOMAIN,
+    CONF_AVAILABILITY_GRACE,
+    CONF_EXPORT_TARGET,
+    CONF_LOW_DUTY,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_POLL_INTERVAL,
+    CONF_SENSORTYPE,
+    CONF_TEMP_DEADBAND,
+    DEFAULT_AVAILABILITY_GRACE,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
+    POLL_INTERVAL_MIN,
+)
+from .discovery import get_device_type
 
 # How long to wait for additional advertisement packets if we don't have the right ones
 ADDITIONAL_DISCOVERY_TIMEOUT = 60
+# Picked in the user step to add every discovered grill at once
+ALL_DEVICES = "all"
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,13 +66,18 @@ class IGrillFlowHandler(ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovery_info: BluetoothServiceInfo | None = None
         self._discovered_devices: dict[str, Discovery] = {}
+        # Every address already resolved, grill or not, so each is only checked once
+        self._seen_addresses: set[str] = set()
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return IGrillOptionsFlowHandler(config_entry)
 
-    def get_device_type(self, name: str) -> str | None:
+    def get_device_type(self, name: str) -> SensorType | None:
         """Resolve a bluetooth device name into a grill sensor type"""
-        for sensor_type in SensorType:
-            if name.lower().startswith(sensor_type.value):
-                return sensor_type
-        return None
+        return get_device_type(name)
 
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfo
@@ -97,6 +126,19 @@ class IGrillFlowHandler(ConfigFlow, domain=DOMAIN):
         """Handle the user step to pick discovered device."""
         if user_input is not None:
             address = user_input[CONF_ADDRESS]
+            if address == ALL_DEVICES:
+                address, *others = self._discovered_devices
+                for other in others:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                            data={
+                                CONF_ADDRESS: other,
+                                "name": self._discovered_devices[other].title,
+                            },
+                        )
+                    )
             await self.async_set_unique_id(address, raise_on_progress=False)
             self._abort_if_unique_id_configured()
             discovery = self._discovered_devices[address]
@@ -106,9 +148,13 @@ class IGrillFlowHandler(ConfigFlow, domain=DOMAIN):
             return self._async_get_or_create_entry()
 
         current_addresses = self._async_current_ids()
+        seen = self._seen_addresses
         for discovery_info in async_discovered_service_info(self.hass, False):
             address = discovery_info.address
-            if address in current_addresses or address in self._discovered_devices:
+            if address in seen:
+                continue
+            seen.add(address)
+            if address in current_addresses:
                 continue
             dev_type = self.get_device_type(discovery_info.name)
             if dev_type:
@@ -125,11 +171,22 @@ class IGrillFlowHandler(ConfigFlow, domain=DOMAIN):
             address: discovery.title
             for (address, discovery) in self._discovered_devices.items()
         }
+        if len(titles) > 1:
+            titles = {ALL_DEVICES: f"All {len(titles)} detected grills", **titles}
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema({vol.Required(CONF_ADDRESS): vol.In(titles)}),
         )
 
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Add one of the grills picked together in the user step."""
+        await self.async_set_unique_id(discovery_info[CONF_ADDRESS])
+        self._abort_if_unique_id_configured()
+        self.context["title_placeholders"] = {"name": discovery_info["name"]}
+        return self._async_get_or_create_entry()
+
     def _async_get_or_create_entry(self):
         data = {
             CONF_SENSORTYPE: self.get_device_type(
@@ -141,3 +198,54 @@ class IGrillFlowHandler(ConfigFlow, domain=DOMAIN):
             title=self.context["title_placeholders"]["name"],
             data=data,
         )
+
+
+class IGrillOptionsFlowHandler(OptionsFlow):
+    """Handle the options for how often values are read and published."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the publish policy and connection mode options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_TEMP_DEADBAND,
+                        default=options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_MIN_PUBLISH_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_AVAILABILITY_GRACE,
+                        default=options.get(
+                            CONF_AVAILABILITY_GRACE, DEFAULT_AVAILABILITY_GRACE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_LOW_DUTY, default=options.get(CONF_LOW_DUTY, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_POLL_INTERVAL,
+                        default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=POLL_INTERVAL_MIN)),
+                    vol.Optional(
+                        CONF_EXPORT_TARGET,
+                        default=options.get(CONF_EXPORT_TARGET, ""),
+                    ): vol.Any("", vol.Match(r"^(tcp://[^/]+:\d+|mqtt://.+)$")),
+                }
+            ),
+        )
@@ -0,0 +1,306 @@
+"""Connection supervision for iGrill peripherals."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from .const import (
+    ACTIVE_COOK_WINDOW,
+    ADAPTER_CONNECTION_SLOTS,
+    BACKOFF_INITIAL,
+    BACKOFF_MAX,
+    POLL_INTERVAL_MIN,
+    POLL_TEMP_STEP,
+)
+from .core import EntityKey, callback
+from .igrill import IDevicePeripheral
+from .rssi import RssiTracker
+
+if TYPE_CHECKING:
+    from bleak_retry_connector import BLEDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionState(Enum):
+    IDLE = "idle"
+    CONNECTING = "connecting"
+    AUTHENTICATING = "authenticating"
+    SUBSCRIBED = "subscribed"
+    BACKOFF = "backoff"
+
+
+class ConnectionScheduler:
+    """
+    Shared by every device in the domain, queues connection attempts so that no
+    adapter runs more than a fixed number at once. Waiting attempts are granted a slot
+    in priority order, then in the order they were queued.
+    """
+
+    def __init__(self, slots_per_adapter: int = ADAPTER_CONNECTION_SLOTS):
+        self._slots_per_adapter = slots_per_adapter
+        self._active: dict[str | None, int] = {}
+        self._waiting: dict[str | None, list] = {}
+        self._sequence = itertools.count()
+
+    async def async_acquire(self, adapter: str | None, priority: int) -> None:
+        """Wait for a connection slot on the adapter, lower priorities go first."""
+        waiting = self._waiting.setdefault(adapter, [])
+        if not waiting and self._active.get(adapter, 0) < self._slots_per_adapter:
+            self._active[adapter] = self._active.get(adapter, 0) + 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(waiting, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self.release(adapter)
+            raise
+
+    @callback
+    def release(self, adapter: str | None) -> None:
+        """Hand the adapter's slot to the next waiting attempt, or free it."""
+        waiting = self._waiting.get(adapter)
+        while waiting:
+            _, _, future = heapq.heappop(waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active[adapter] -= 1
+
+
+class ConnectionSupervisor:
+    """
+    Owns the connection lifecycle of a single peripheral.
+    Advertisements only start a connect attempt while idle, so at most one attempt
+    is ever in flight, and failed attempts are retried with jittered exponential backoff.
+
+    In low duty mode the connection is not held: each attempt reads every value once
+    and disconnects, and the next one waits for an interval that shrinks while probe
+    temperatures are changing quickly.
+    """
+
+    def __init__(
+        self,
+        peripheral: IDevicePeripheral,
+        backoff_initial: float = BACKOFF_INITIAL,
+        backoff_max: float = BACKOFF_MAX,
+        scheduler: ConnectionScheduler | None = None,
+        low_duty_interval: float | None = None,
+    ):
+        self.peripheral = peripheral
+        self.scheduler = scheduler
+        self.state = ConnectionState.IDLE
+        self.failures = 0
+        self._backoff_initial = backoff_initial
+        self._backoff_max = backoff_max
+        self._ble_device: BLEDevice | None = None
+        self._adapter: str | None = None
+        self._task: asyncio.Task | None = None
+        self._retry_handle: asyncio.TimerHandle | None = None
+        self.low_duty_interval = low_duty_interval
+        self.poll_interval: float | None = None
+        self._next_poll = 0.0
+        self._last_poll: tuple[float, dict[str, float]] | None = None
+        self._stale_handle: asyncio.TimerHandle | None = None
+        self.rssi = RssiTracker()
+        self._remove_disconnect_listener = peripheral.async_add_disconnect_listener(
+            self._async_disconnected
+        )
+
+    @callback
+    def async_advertisement(
+        self,
+        ble_device: BLEDevice,
+        adapter: str | None = None,
+        rssi: float | None = None,
+    ) -> None:
+        """
+        Track the advertisement's signal strength and connect, through the scanner
+        with the best signal, if nothing is in flight and the signal is good enough.
+        """
+        now = time.monotonic()
+        self.rssi.add(adapter, ble_device, rssi, now)
+        if best := self.rssi.best(now):
+            adapter, source = best
+            ble_device = source.device
+            self.peripheral.update_rssi(source.smoothed)
+        else:
+            source = None
+        self._ble_device = ble_device
+        self._adapter = adapter
+        if self.state is ConnectionState.IDLE and now >= self._next_poll:
+            if self.rssi.connectable(source):
+                self._async_start()
+            else:
+                self.peripheral.metrics.counters["weak_signal_skips"] += 1
+
+    @callback
+    def async_delay_start(self, delay: float) -> None:
+        """Ignore advertisements for delay seconds, to stagger the first attempts of many devices."""
+        self._next_poll = max(self._next_poll, time.monotonic() + delay)
+
+    @property
+    def priority(self) -> int:
+        """Devices that are actively cooking are scheduled ahead of idle ones."""
+        last_change = self.peripheral.last_temp_change
+        if last_change and time.monotonic() - last_change < ACTIVE_COOK_WINDOW:
+            return 0
+        return 1
+
+    def backoff_delay(self) -> float:
+        """Return the delay before the next attempt, with jitter applied."""
+        delay = min(
+            self._backoff_max, self._backoff_initial * 2 ** max(self.failures - 1, 0)
+        )
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @callback
+    def _async_start(self) -> None:
+        self._retry_handle = None
+        if self.peripheral.closed or self._ble_device is None:
+            self.state = ConnectionState.IDLE
+            return
+        self.state = ConnectionState.CONNECTING
+        self._task = asyncio.get_running_loop().create_task(
+            self._async_run(self._ble_device, self._adapter)
+        )
+
+    async def _async_run(self, ble_device: BLEDevice, adapter: str | None) -> None:
+        if self.scheduler:
+            await self.scheduler.async_acquire(adapter, self.priority)
+        try:
+            await self._async_attempt(ble_device)
+        finally:
+            if self.scheduler:
+                self.scheduler.release(adapter)
+            self._task = None
+
+    async def _async_attempt(self, ble_device: BLEDevice) -> None:
+        from bleak.exc import BleakError
+
+        peripheral = self.peripheral
+        try:
+            await peripheral.async_connect(ble_device)
+            self.state = ConnectionState.AUTHENTICATING
+            await peripheral.async_authenticate()
+            await peripheral.async_subscribe(notify=self.low_duty_interval is None)
+            if self.low_duty_interval is not None:
+                self._async_polled()
+                await peripheral.async_disconnect()
+        except asyncio.CancelledError:
+            raise
+        except (BleakError, asyncio.TimeoutError, EOFError) as err:
+            self._async_failed(err)
+            await peripheral.async_disconnect()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected error connecting to %s", ble_device.address)
+            self._async_failed(err)
+            await peripheral.async_disconnect()
+        else:
+            self.failures = 0
+            client = peripheral.client
+            if self.low_duty_interval is None and client and client.is_connected:
+                self.state = ConnectionState.SUBSCRIBED
+            else:
+                # Polled, or the link dropped after the last operation, where the
+                # disconnect was seen while still authenticating
+                self.state = ConnectionState.IDLE
+
+    def next_poll_interval(self, now: float) -> float:
+        """
+        Seconds until the next low duty poll, aiming for the fastest changing probe to
+        move about POLL_TEMP_STEP between polls.
+        """
+        temperatures = {
+            key: value
+            for key in self.peripheral.predictors
+            if (value := self.peripheral.get_data(EntityKey(key, None)))
+        }
+        interval = self.low_duty_interval
+        if self._last_poll:
+            last_time, last_temperatures = self._last_poll
+            change = max(
+                (
+                    abs(value - last_temperatures[key])
+                    for key, value in temperatures.items()
+                    if key in last_temperatures
+                ),
+                default=0.0,
+            )
+            if change:
+                interval = POLL_TEMP_STEP * (now - last_time) / change
+        self._last_poll = (now, temperatures)
+        return max(POLL_INTERVAL_MIN, min(self.low_duty_interval, interval))
+
+    @callback
+    def _async_polled(self) -> None:
+        """Schedule the next poll, keeping the values available until it is overdue."""
+        peripheral = self.peripheral
+        now = time.monotonic()
+        self.poll_interval = interval = self.next_poll_interval(now)
+        self._next_poll = now + interval
+        peripheral.metrics.counters["polls"] += 1
+        peripheral.poll_deadline = now + 2 * interval
+        loop = asyncio.get_running_loop()
+        self._retry_handle = loop.call_later(interval, self._async_poll_due)
+        if self._stale_handle:
+            self._stale_handle.cancel()
+        self._stale_handle = loop.call_later(
+            2 * interval, peripheral.refresh_availability
+        )
+
+    @callback
+    def _async_poll_due(self) -> None:
+        # An advertisement may have started the poll already
+        self._retry_handle = None
+        if self.state is ConnectionState.IDLE:
+            self._async_start()
+
+    @callback
+    def _async_failed(self, err: Exception) -> None:
+        self.failures += 1
+        self.peripheral.metrics.counters["connect_failures"] += 1
+        delay = self.backoff_delay()
+        _LOGGER.debug(
+            "Connecting to %s failed (%s), attempt %d, retrying in %.1fs",
+            self._ble_device.address,
+            err,
+            self.failures,
+            delay,
+        )
+        self.state = ConnectionState.BACKOFF
+        if self._retry_handle:
+            self._retry_handle.cancel()
+        self._retry_handle = asyncio.get_running_loop().call_later(
+            delay, self._async_start
+        )
+
+    @callback
+    def _async_disconnected(self) -> None:
+        # Disconnects while connecting surface as errors in _async_attempt instead
+        if self.state is ConnectionState.SUBSCRIBED:
+            self.state = ConnectionState.IDLE
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop supervising, cancelling any pending attempt."""
+        self._remove_disconnect_listener()
+        if self._retry_handle:
+            self._retry_handle.cancel()
+            self._retry_handle = None
+        if self._stale_handle:
+            self._stale_handle.cancel()
+            self._stale_handle = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.state = ConnectionState.IDLE
@@ -3,8 +3,19 @@ from __future__ import annotations
 from datetime import timedelta
 from enum import Enum
 
+CONF_AVAILABILITY_GRACE = "availability_grace"
+CONF_CAPABILITIES = "capabilities"
+CONF_EXPORT_TARGET = "export_target"
+CONF_LOW_DUTY = "low_duty"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_TEMP_DEADBAND = "temperature_deadband"
 CONF_SENSORTYPE = "sensortype"
 DEVICE_TIMEOUT = 10
+DEFAULT_AVAILABILITY_GRACE = 30.0
+DEFAULT_MIN_PUBLISH_INTERVAL = 0.0
+DEFAULT_POLL_INTERVAL = 300
+DEFAULT_TEMP_DEADBAND = 0.0
 DOMAIN = "igrill_ble"
 
 
@@ -18,3 +29,67 @@ class SensorType(Enum):
     KITCHEN_THERMOMETER_MINI = "kt_mini"
     PULSE_1000 = "pulse_1000"
     PULSE_2000 = "pulse_2000"
+
+# Reconnect backoff bounds in seconds
+BACKOFF_INITIAL = 5
+BACKOFF_MAX = 300
+
+# Maximum number of characteristics subscribed to and read at the same time
+SUBSCRIBE_CONCURRENCY = 4
+
+# Concurrent connection attempts allowed per bluetooth adapter
+ADAPTER_CONNECTION_SLOTS = 2
+# Devices with a temperature change this recent (seconds) are connected first
+ACTIVE_COOK_WINDOW = 600
+# Connection attempts wait for a smoothed RSSI (dBm) of at least RSSI_MIN_CONNECT, or
+# within RSSI_TREND_MARGIN of it while improving. Scanners that have not seen the
+# device for RSSI_STALE seconds are no longer used to connect.
+RSSI_MIN_CONNECT = -90
+RSSI_TREND_MARGIN = 5
+RSSI_SMOOTHING = 0.3
+RSSI_STALE = 60
+# Published signal strength changes, in dBm and seconds
+RSSI_PUBLISH_DEADBAND = 3
+RSSI_PUBLISH_INTERVAL = 30
+# Seconds between the first connection attempts of grills set up together
+STARTUP_STAGGER = 0.2
+DATA_COORDINATOR = "coordinator"
+
+# Low duty mode polls at most this often (seconds), and sooner than the configured
+# interval only while a probe is changing by more than POLL_TEMP_STEP (°C) per poll
+POLL_INTERVAL_MIN = 30
+POLL_TEMP_STEP = 1.0
+
+# Samples kept per sensor, 12 hours at the probes' 1Hz notification rate
+HISTORY_SIZE = 43200
+DATA_WEBSOCKET_REGISTERED = "websocket_registered"
+
+# Cook prediction tuning, temperatures in °C and rates in °C per second
+PREDICTION_HALF_LIFE = 600
+PREDICTION_MIN_SAMPLES = 30
+STALL_RANGE = (60, 80)
+STALL_MAX_RATE = 2 / 3600
+
+ATTR_TARGET_TEMPERATURE = "target_temperature"
+SERVICE_SET_PROBE_TARGET = "set_probe_target"
+
+# Degrees a probe must drop below its threshold before it can fire again
+THRESHOLD_HYSTERESIS = 1.0
+EVENT_PROBE_THRESHOLD = f"{DOMAIN}_probe_threshold"
+
+# Entity catalogs of the config entries, keyed by entry id
+DATA_CATALOGS = "catalogs"
+
+# Readings export, batches are sent once full or flush interval seconds after their
+# first line, and failed sends are retried with backoff up to the retry max (seconds)
+EXPORT_MEASUREMENT = "igrill"
+EXPORT_QUEUE_SIZE = 10000
+EXPORT_BATCH_SIZE = 500
+EXPORT_FLUSH_INTERVAL = 1.0
+EXPORT_RETRY_MAX = 60
+DATA_EXPORTERS = "exporters"
+
+# Standalone daemon, socket clients with more than the buffer limit (bytes) unsent
+# are dropped, and simulated grills advertise every interval (seconds)
+STREAM_BUFFER_LIMIT = 1 << 20
+SIMULATED_ADVERTISEMENT_INTERVAL = 1.0
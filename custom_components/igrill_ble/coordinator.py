@@ -0,0 +1,77 @@
+"""Coordination of every configured grill."""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from functools import partial
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth.match import BluetoothCallbackMatcher
+from homeassistant.core import HomeAssistant, callback
+
+from .connection import ConnectionScheduler, ConnectionSupervisor
+from .const import STARTUP_STAGGER
+
+
+class IGrillCoordinator:
+    """
+    Shared by all config entries. Holds every grill's connection supervisor and
+    routes advertisements to them by address from a single bluetooth callback per
+    scanning mode, instead of one registration per grill. Each callback only routes
+    to the grills scanned in its own mode, as Home Assistant delivers an
+    advertisement to every mode's callback. Grills added in quick succession, e.g.
+    at startup, have their first connection attempts staggered.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.scheduler = ConnectionScheduler()
+        self.supervisors: dict[
+            bluetooth.BluetoothScanningMode, dict[str, ConnectionSupervisor]
+        ] = {}
+        self._unregister: dict[bluetooth.BluetoothScanningMode, Callable[[], None]] = {}
+        self._next_start = 0.0
+
+    @callback
+    def async_add_device(
+        self,
+        address: str,
+        supervisor: ConnectionSupervisor,
+        mode: bluetooth.BluetoothScanningMode,
+    ) -> Callable[[], None]:
+        """Route the address' advertisements to the supervisor, until the returned callback is called."""
+        now = time.monotonic()
+        self._next_start = max(self._next_start, now)
+        supervisor.async_delay_start(self._next_start - now)
+        self._next_start += STARTUP_STAGGER
+        supervisors = self.supervisors.setdefault(mode, {})
+        supervisors[address] = supervisor
+        if mode not in self._unregister:
+            self._unregister[mode] = bluetooth.async_register_callback(
+                self.hass,
+                partial(self._async_advertisement, supervisors),
+                BluetoothCallbackMatcher(connectable=True),
+                mode,
+            )
+
+        @callback
+        def remove_device() -> None:
+            """Stop routing advertisements to the supervisor."""
+            del supervisors[address]
+            if not supervisors:
+                del self.supervisors[mode]
+                self._unregister.pop(mode)()
+
+        return remove_device
+
+    @callback
+    def _async_advertisement(
+        self,
+        supervisors: dict[str, ConnectionSupervisor],
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        if supervisor := supervisors.get(service_info.address):
+            supervisor.async_advertisement(
+                service_info.device, service_info.source, service_info.rssi
+            )
@@ -0,0 +1,29 @@
+"""
+The few Home Assistant names the protocol modules use, so that the protocol,
+authentication, decoding, connection handling and export (igrill.py, decoders.py,
+throttle.py, connection.py and exporter.py) import and run without Home Assistant,
+e.g. in cli.py.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import NamedTuple, TypeVar
+
+_CallableT = TypeVar("_CallableT", bound=Callable)
+
+
+class EntityKey(NamedTuple):
+    """
+    Identifies a sensor value of a device. Being a tuple of the same fields, it
+    compares and hashes equal to Home Assistant's PassiveBluetoothEntityKey, so
+    either can be used to look values up.
+    """
+
+    key: str
+    device_id: str | None
+
+
+def callback(func: _CallableT) -> _CallableT:
+    """Mark a function as safe to run in the event loop, as homeassistant.core.callback does."""
+    setattr(func, "_hass_callback", True)
+    return func
@@ -0,0 +1,109 @@
+"""Payload decoders for the iGrill notification characteristics."""
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable
+from typing import NamedTuple
+
+from sensor_state_data import SensorDeviceClass, SensorLibrary, Units
+from sensor_state_data.description import BaseSensorDescription
+
+from .core import EntityKey
+
+# Reported by a probe socket with nothing plugged in
+PROBE_UNPLUGGED = 63536
+
+PROPANE_PERCENTAGE = BaseSensorDescription(
+    device_class=SensorDeviceClass.GAS,
+    native_unit_of_measurement=Units.PERCENTAGE,
+)
+
+SIGNAL_STRENGTH = BaseSensorDescription(
+    device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+    native_unit_of_measurement=Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+)
+
+_UINT16 = struct.Struct("<H")
+
+
+class Decoder(NamedTuple):
+    """Turns a characteristic payload into the values of its sensor keys."""
+
+    description: BaseSensorDescription
+    keys: tuple[str, ...]
+    entity_keys: tuple[EntityKey, ...]
+    decode: Callable[[bytes], tuple]
+
+
+def _check_length(payload: bytes, length: int) -> None:
+    # Malformed payloads raise ValueError, as any decoder does, rather than the
+    # struct.error or IndexError of reading past their end
+    if len(payload) < length:
+        raise ValueError(f"Payload too short: {bytes(payload)!r}")
+
+
+def decode_temperature(payload: bytes) -> tuple:
+    _check_length(payload, _UINT16.size)
+    (temp,) = _UINT16.unpack_from(payload)
+    return (0 if temp == PROBE_UNPLUGGED else float(temp),)
+
+
+def encode_temperature(temp: float) -> bytes:
+    return _UINT16.pack(int(round(temp)))
+
+
+def decode_heating_elements(payload: bytes) -> tuple:
+    # ASCII "<left actual> <right actual> <left setpoint> <right setpoint>", any
+    # further fields are ignored. float() accepts bytes, so the payload never needs
+    # decoding to str
+    fields = payload.split()
+    if len(fields) < 4:
+        raise ValueError(f"Heating element payload too short: {bytes(payload)!r}")
+    return tuple(map(float, fields[:4]))
+
+
+def decode_battery(payload: bytes) -> tuple:
+    _check_length(payload, 1)
+    return (payload[0],)
+
+
+def decode_propane(payload: bytes) -> tuple:
+    _check_length(payload, 1)
+    return (payload[0] * 25.0,)
+
+
+def make_decoder(
+    description: BaseSensorDescription,
+    keys: tuple[str, ...],
+    decode: Callable[[bytes], tuple],
+) -> Decoder:
+    return Decoder(
+        description,
+        keys,
+        tuple(EntityKey(key, None) for key in keys),
+        decode,
+    )
+
+
+def temperature_decoder(key: str) -> Decoder:
+    return make_decoder(
+        SensorLibrary.TEMPERATURE__CELSIUS, (key,), decode_temperature
+    )
+
+
+HEATING_ELEMENTS_DECODER = make_decoder(
+    SensorLibrary.TEMPERATURE__CELSIUS,
+    (
+        "heating_element_left_actual",
+        "heating_element_right_actual",
+        "heating_element_left_setpoint",
+        "heating_element_right_setpoint",
+    ),
+    decode_heating_elements,
+)
+BATTERY_DECODER = make_decoder(
+    SensorLibrary.BATTERY__PERCENTAGE, ("battery",), decode_battery
+)
+PROPANE_DECODER = make_decoder(
+    PROPANE_PERCENTAGE, ("propane_percentage",), decode_propane
+)
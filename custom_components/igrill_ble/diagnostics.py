@@ -0,0 +1,26 @@
+"""Diagnostics support for the igrill integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_EXPORTERS, DOMAIN
+from .igrill import IDevicePeripheral
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    igrill: IDevicePeripheral = hass.data[DOMAIN][entry.entry_id]
+    exporter = hass.data[DOMAIN].get(DATA_EXPORTERS, {}).get(entry.entry_id)
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "device": igrill.diagnostics(),
+        "exporter": exporter.diagnostics() if exporter else None,
+    }
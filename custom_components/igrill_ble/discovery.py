@@ -0,0 +1,43 @@
+"""Resolution of advertised local names to grill models."""
+from __future__ import annotations
+
+from .const import SensorType
+
+
+class PrefixIndex:
+    """
+    A character trie mapping name prefixes to values. Lookups walk the name once
+    and return the value of the longest matching prefix, so "igrill_mini_2" is not
+    mistaken for "igrill_mini".
+    """
+
+    _VALUE = ""
+
+    def __init__(self, prefixes: dict[str, object]) -> None:
+        self._root: dict = {}
+        for prefix, value in prefixes.items():
+            node = self._root
+            for char in prefix.lower():
+                node = node.setdefault(char, {})
+            # The empty string never collides with the single character edges
+            node[self._VALUE] = value
+
+    def longest_prefix(self, name: str):
+        node = self._root
+        found = node.get(self._VALUE)
+        for char in name.lower():
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(self._VALUE, found)
+        return found
+
+
+SENSOR_TYPES = PrefixIndex({sensor_type.value: sensor_type for sensor_type in SensorType})
+
+
+def get_device_type(name: str | None) -> SensorType | None:
+    """Resolve a bluetooth device name into a grill sensor type."""
+    if not name:
+        return None
+    return SENSOR_TYPES.longest_prefix(name)
@@ -0,0 +1,206 @@
+"""Export of raw readings to an external time series pipeline."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Protocol
+
+from .const import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_FLUSH_INTERVAL,
+    EXPORT_MEASUREMENT,
+    EXPORT_QUEUE_SIZE,
+    EXPORT_RETRY_MAX,
+)
+from .core import EntityKey, callback
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+_ESCAPE_TAG = re.compile(r"([,= ])")
+
+
+def _escape(text: str) -> str:
+    """Escape a tag key, tag value or field key for the line protocol."""
+    return _ESCAPE_TAG.sub(r"\\\1", text)
+
+
+class ExportSink(Protocol):
+    async def async_send(self, lines: list[str]) -> None:
+        """Deliver a batch of lines, raising if it could not be delivered."""
+
+    async def async_close(self) -> None:
+        ...
+
+
+class LineProtocolSink:
+    """Writes lines to a TCP line protocol listener, e.g. Telegraf's socket_listener."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def async_send(self, lines: list[str]) -> None:
+        if self._writer is None:
+            _, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self._writer.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            await self._writer.drain()
+        except (ConnectionError, OSError):
+            await self.async_close()
+            raise
+
+    async def async_close(self) -> None:
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class MqttSink:
+    """Publishes each batch as one line protocol message through Home Assistant's MQTT."""
+
+    def __init__(self, hass: HomeAssistant, topic: str) -> None:
+        self.hass = hass
+        self.topic = topic
+
+    async def async_send(self, lines: list[str]) -> None:
+        # Only imported when configured, MQTT is not a dependency of the integration
+        from homeassistant.components import mqtt
+
+        await mqtt.async_publish(self.hass, self.topic, "\n".join(lines))
+
+    async def async_close(self) -> None:
+        pass
+
+
+def sink_from_target(hass: HomeAssistant, target: str) -> ExportSink:
+    """Build the sink for a tcp://host:port or mqtt://topic export target."""
+    scheme, _, location = target.partition("://")
+    if scheme == "tcp":
+        host, _, port = location.rpartition(":")
+        return LineProtocolSink(host, int(port))
+    if scheme == "mqtt":
+        return MqttSink(hass, location)
+    raise ValueError(f"Unsupported export target {target}")
+
+
+class Exporter:
+    """
+    Queues every batch of changed values as one line protocol line and sends them
+    from a background task, in batches of up to batch_size lines or whatever has
+    arrived within flush_interval of the first one.
+    Queueing never blocks: when the sink can't keep up and the queue is full, the
+    oldest line is dropped. Failed batches are retried with backoff, meanwhile new
+    lines keep queueing and overflowing.
+    """
+
+    def __init__(
+        self,
+        sink: ExportSink,
+        tags: dict[str, str],
+        queue_size: int = EXPORT_QUEUE_SIZE,
+        batch_size: int = EXPORT_BATCH_SIZE,
+        flush_interval: float = EXPORT_FLUSH_INTERVAL,
+    ) -> None:
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.counters: Counter[str] = Counter()
+        self._prefix = _escape(EXPORT_MEASUREMENT) + "".join(
+            f",{_escape(key)}={_escape(value)}" for key, value in sorted(tags.items())
+        )
+        self._queue: asyncio.Queue[str] = asyncio.Queue(queue_size)
+        self._task: asyncio.Task | None = None
+        self._batch: list[str] = []
+
+    @callback
+    def async_values(self, changed: dict[EntityKey, Any]) -> None:
+        """Queue one batch of changed values, the listener registered with the device."""
+        fields = ",".join(
+            f"{_escape(entity_key.key)}={float(value)}"
+            for entity_key, value in changed.items()
+            if isinstance(value, (int, float))
+        )
+        if not fields:
+            return
+        queue = self._queue
+        if queue.full():
+            queue.get_nowait()
+            self.counters["dropped"] += 1
+        queue.put_nowait(f"{self._prefix} {fields} {time.time_ns()}")
+
+    @callback
+    def async_start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+    async def async_stop(self) -> None:
+        """Stop sending, making one last attempt to deliver what is still queued."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        lines = self._batch + self._drain(self._queue.qsize())
+        self._batch = []
+        try:
+            if lines:
+                await self._async_send(lines)
+        except Exception as err:  # pylint: disable=broad-except
+            self.counters["dropped"] += len(lines)
+            _LOGGER.debug("Dropped %d lines on stop: %s", len(lines), err)
+        finally:
+            await self.sink.async_close()
+
+    def _drain(self, limit: int) -> list[str]:
+        lines = []
+        queue = self._queue
+        while len(lines) < limit and not queue.empty():
+            lines.append(queue.get_nowait())
+        return lines
+
+    async def _async_send(self, lines: list[str]) -> None:
+        await self.sink.async_send(lines)
+        self.counters["batches"] += 1
+        self.counters["lines"] += len(lines)
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = lines = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(lines) < self.batch_size:
+                lines.extend(self._drain(self.batch_size - len(lines)))
+                remaining = deadline - loop.time()
+                if len(lines) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    lines.append(
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            delay = self.flush_interval
+            while True:
+                try:
+                    await self._async_send(lines)
+                    self._batch = []
+                    break
+                except Exception as err:  # pylint: disable=broad-except
+                    self.counters["send_failures"] += 1
+                    _LOGGER.debug("Export failed (%s), retrying in %.1fs", err, delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, EXPORT_RETRY_MAX)
+
+    def diagnostics(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "counters": dict(self.counters),
+        }
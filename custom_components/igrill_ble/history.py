@@ -0,0 +1,138 @@
+"""Fixed size in-memory history of sensor values."""
+from __future__ import annotations
+
+import time
+from array import array
+
+from .const import HISTORY_SIZE
+
+
+class RingBuffer:
+    """
+    Timestamped samples in two arrays, uint32 unix seconds and float32 values, grown
+    as samples arrive up to capacity and then overwriting the oldest sample, so a
+    device that is rarely cooked with doesn't hold a full buffer per sensor.
+    """
+
+    __slots__ = ("capacity", "times", "values", "start", "size")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.times = array("I")
+        self.values = array("f")
+        self.start = 0
+        self.size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.times.itemsize * len(self.times)
+            + self.values.itemsize * len(self.values)
+        )
+
+    def append(self, timestamp: int, value: float) -> None:
+        if self.size < self.capacity:
+            # Not wrapped yet, so the next sample goes at the end
+            self.times.append(timestamp)
+            self.values.append(value)
+            self.size += 1
+            return
+        index = self.start
+        self.start = (self.start + 1) % self.capacity
+        self.times[index] = timestamp
+        self.values[index] = value
+
+    def _find(self, timestamp: float) -> int:
+        """Logical index of the first sample at or after timestamp."""
+        times, start, capacity = self.times, self.start, self.capacity
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if times[(start + middle) % capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def downsample(
+        self, since: float | None, until: float | None, buckets: int
+    ) -> list[dict]:
+        """Aggregate the samples in [since, until] into equal width time buckets."""
+        if not self.size:
+            return []
+        times, values, start, capacity = (
+            self.times,
+            self.values,
+            self.start,
+            self.capacity,
+        )
+        first = self._find(since) if since is not None else 0
+        last = self._find(until + 1) if until is not None else self.size
+        if first >= last:
+            return []
+        begin = times[(start + first) % capacity] if since is None else since
+        end = times[(start + last - 1) % capacity] if until is None else until
+        width = max((end - begin + 1) / buckets, 1)
+        result: list[dict] = []
+        bucket = None
+        for logical in range(first, last):
+            index = (start + logical) % capacity
+            timestamp, value = times[index], values[index]
+            number = int((timestamp - begin) // width)
+            if bucket is None or bucket["number"] != number:
+                bucket = {
+                    "number": number,
+                    "start": begin + number * width,
+                    "min": value,
+                    "max": value,
+                    "total": 0.0,
+                    "count": 0,
+                }
+                result.append(bucket)
+            if value < bucket["min"]:
+                bucket["min"] = value
+            elif value > bucket["max"]:
+                bucket["max"] = value
+            bucket["total"] += value
+            bucket["count"] += 1
+        return [
+            {
+                "start": bucket["start"],
+                "end": bucket["start"] + width,
+                "min": bucket["min"],
+                "max": bucket["max"],
+                "mean": bucket["total"] / bucket["count"],
+                "count": bucket["count"],
+            }
+            for bucket in result
+        ]
+
+
+class History:
+    """One ring buffer per sensor key, allocated when the key is first recorded."""
+
+    def __init__(self, capacity: int = HISTORY_SIZE) -> None:
+        self.capacity = capacity
+        self.buffers: dict[str, RingBuffer] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def record(self, key: str, value: float, timestamp: float | None = None) -> None:
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = RingBuffer(self.capacity)
+        buffer.append(int(time.time() if timestamp is None else timestamp), value)
+
+    def query(
+        self,
+        key: str,
+        since: float | None = None,
+        until: float | None = None,
+        buckets: int = 100,
+    ) -> list[dict]:
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            return []
+        return buffer.downsample(since, until, buckets)
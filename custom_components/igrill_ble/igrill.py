@@ -1,32 +1,61 @@
+from __future__ import annotations
+
 from builtins import range
 from builtins import object
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-from bleak import BleakClient
+if TYPE_CHECKING:
+    # The BLE stack itself is only imported once a connection is attempted
+    from bleak.exc import BleakError
+    from bleak_retry_connector import BLEDevice
 
-from bleak_retry_connector import (
-    BLEDevice,
-    establish_connection,
+from .core import EntityKey, callback
+from .const import (
+    RSSI_PUBLISH_DEADBAND,
+    RSSI_PUBLISH_INTERVAL,
+    SUBSCRIBE_CONCURRENCY,
+    THRESHOLD_HYSTERESIS,
+    SensorType,
 )
-
-from homeassistant.components.bluetooth.passive_update_processor import (
-    PassiveBluetoothEntityKey,
+from .history import History
+from .metrics import DeviceMetrics
+from .prediction import ProbePredictor
+from .throttle import PublishPolicy, PublishThrottle
+from .writes import WriteQueue
+from .decoders import (
+    BATTERY_DECODER,
+    HEATING_ELEMENTS_DECODER,
+    PROPANE_DECODER,
+    SIGNAL_STRENGTH,
+    Decoder,
+    encode_temperature,
+    temperature_decoder,
 )
-from homeassistant.core import callback
-from .const import SensorType
 import asyncio
-from bluetooth_sensor_state_data import BluetoothData
+import functools
+import time
 from sensor_state_data import (
+    DeviceKey,
+    SensorDescription,
     SensorDeviceClass,
-    SensorLibrary,
+    SensorDeviceInfo,
     SensorUpdate,
-    Units,
+    SensorValue,
 )
-from sensor_state_data.description import BaseSensorDescription
 
 _LOGGER = logging.getLogger(__name__)
-CONNECT_LOCK = asyncio.Lock()
+_MISSING = object()
+_SIGNAL_STRENGTH_KEY = EntityKey(SIGNAL_STRENGTH.device_class.value, None)
+# Fragments of the errors BlueZ and the other backends raise when a read needs authentication
+AUTH_ERRORS = ("authoriz", "authentic", "notpermitted", "not permitted", "encrypt")
+
+
+def _is_auth_error(err: BleakError) -> bool:
+    message = str(err).lower()
+    return any(fragment in message for fragment in AUTH_ERRORS)
 
 
 class UUIDS(object):
@@ -59,7 +88,147 @@ class UUIDS(object):
     LED_KNOB_TOGGLE = "EAEF0001-3909-454C-9D7E-E68CBA24A9B8"
 
 
-class IDevicePeripheral(BluetoothData):
+# Payload decoders keyed by lower case characteristic uuid
+DECODERS = {
+    **{
+        getattr(UUIDS, f"PROBE{probe_num}_TEMPERATURE").lower(): temperature_decoder(
+            f"probe_{probe_num}"
+        )
+        for probe_num in range(1, 5)
+    },
+    UUIDS.AMBIENT_TEMPERATURE.lower(): temperature_decoder("ambient_temp"),
+    UUIDS.HEATING_ELEMENTS.lower(): HEATING_ELEMENTS_DECODER,
+    UUIDS.BATTERY_LEVEL.lower(): BATTERY_DECODER,
+    UUIDS.PROPANE_LEVEL.lower(): PROPANE_DECODER,
+}
+
+
+class ModelSpec(NamedTuple):
+    """
+    What a model of device looks like, built once per model and shared by all of its
+    devices: the characteristics of its probes and the slot of every value it can
+    report in a device's preallocated value list.
+    """
+
+    name: str
+    num_probes: int
+    has_battery: bool
+    has_heating_element: bool
+    has_propane: bool
+    has_led_knob_light: bool
+    # Probe number to temperature characteristic, and back
+    probe_chars: Mapping[int, str]
+    temp_chars: Mapping[str, int]
+    temp_threshold_chars: Mapping[int, str]
+    slots: Mapping[EntityKey, int]
+
+
+@functools.lru_cache(maxsize=None)
+def model_spec(
+    name,
+    num_probes,
+    has_battery=True,
+    has_heating_element=False,
+    has_propane=False,
+    has_led_knob_light=False,
+) -> ModelSpec:
+    probe_chars = {
+        probe_num: getattr(UUIDS, f"PROBE{probe_num}_TEMPERATURE")
+        for probe_num in range(1, num_probes + 1)
+    }
+    keys = [SIGNAL_STRENGTH.device_class.value]
+    for probe_num in probe_chars:
+        keys.extend(
+            f"probe_{probe_num}{suffix}" for suffix in ("", "_rate", "_eta", "_target")
+        )
+    # Whether the ambient probe exists is only known once the device is discovered
+    keys.extend(DECODERS[UUIDS.AMBIENT_TEMPERATURE.lower()].keys)
+    for present, char in (
+        (has_heating_element, UUIDS.HEATING_ELEMENTS),
+        (has_battery, UUIDS.BATTERY_LEVEL),
+        (has_propane, UUIDS.PROPANE_LEVEL),
+    ):
+        if present:
+            keys.extend(DECODERS[char.lower()].keys)
+    return ModelSpec(
+        name,
+        num_probes,
+        has_battery,
+        has_heating_element,
+        has_propane,
+        has_led_knob_light,
+        MappingProxyType(probe_chars),
+        MappingProxyType({char: probe_num for probe_num, char in probe_chars.items()}),
+        MappingProxyType(
+            {
+                probe_num: getattr(UUIDS, f"PROBE{probe_num}_THRESHOLD")
+                for probe_num in probe_chars
+            }
+        ),
+        MappingProxyType(
+            {EntityKey(key, None): slot for slot, key in enumerate(keys)}
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _sensor_description(key: str, description) -> SensorDescription:
+    """The description of a value for entity creation, shared by every device reporting it."""
+    return SensorDescription(
+        device_key=DeviceKey(key),
+        device_class=description.device_class,
+        native_unit_of_measurement=description.native_unit_of_measurement,
+    )
+
+
+class IDevicePeripheral:
+    # No instance __dict__, so a device costs only its slots and the containers in them
+    __slots__ = (
+        "model",
+        "device_info",
+        "_descriptions",
+        "has_ambient_temp",
+        "retrieved_device_info",
+        "capabilities",
+        "firmware",
+        "authenticated",
+        "_session_resumed",
+        "handshake_time",
+        "last_temp_change",
+        "poll_deadline",
+        "availability_grace",
+        "_grace_handle",
+        "_published_available",
+        "metrics",
+        "writes",
+        "led_on",
+        "_led_lock",
+        "history",
+        "predictors",
+        "thresholds",
+        "_threshold_reached",
+        "_threshold_listeners",
+        "_disconnect_reason",
+        "_capabilities_listeners",
+        "is_celsius",
+        "client",
+        "client_class",
+        "_listeners",
+        "_disconnect_listeners",
+        "_values_listeners",
+        "_entity_listeners",
+        "_values",
+        "_changed",
+        "_pending",
+        "_pending_since",
+        "_dispatch_handle",
+        "_has_new_entities",
+        "throttle",
+        "bt_name",
+        "address",
+        "closed",
+    )
+
     def __init__(
         self,
         name,
@@ -72,33 +241,106 @@ class IDevicePeripheral(BluetoothData):
         """
         Connects to the device given by address performing necessary authentication
         """
-        super().__init__()
-        self.name = name
-        self.has_battery = has_battery
-        self.has_propane = has_propane
-        self.has_heating_element = has_heating_element
-        self.has_led_knob_light = has_led_knob_light
+        self.model = model_spec(
+            name,
+            num_probes,
+            has_battery,
+            has_heating_element,
+            has_propane,
+            has_led_knob_light,
+        )
+        self.device_info = SensorDeviceInfo(None, None, None, None, None)
+        # Descriptions of the values seen so far, by key, for the entity creation snapshot
+        self._descriptions: dict[DeviceKey, SensorDescription] = {}
         self.has_ambient_temp = False
-        self.num_probes = num_probes
-        self.temp_chars = {}
-        self.temp_threshold_chars = {}
         self.retrieved_device_info = False
+        self.capabilities = None
+        self.firmware = None
+        self.authenticated = False
+        # Whether the current connection resumed the bond rather than handshaking
+        self._session_resumed = False
+        self.handshake_time = None
+        self.last_temp_change = None
+        self.poll_deadline = None
+        self.availability_grace = 0.0
+        self._grace_handle: asyncio.TimerHandle | None = None
+        self._published_available = False
+        self.metrics = DeviceMetrics()
+        self.writes = WriteQueue(self._async_write_now, self.metrics)
+        self.led_on: bool | None = None
+        self._led_lock = asyncio.Lock() if has_led_knob_light else None
+        self.history = History()
+        self.predictors: dict[str, ProbePredictor] = {
+            f"probe_{probe_num}": ProbePredictor() for probe_num in self.probe_chars
+        }
+        self.thresholds: dict[str, float] = {}
+        self._threshold_reached: dict[str, bool] = {}
+        self._threshold_listeners: list[Callable[[str, float, float, bool], None]] = []
+        self._disconnect_reason = None
+        self._capabilities_listeners: list[Callable[[dict], None]] = []
         self.is_celsius = False
         self.client = None
+        # None connects with bleak's BleakClient
+        self.client_class = None
         self._listeners = []
-        self.data = {}
+        self._disconnect_listeners: list[Callable[[], None]] = []
+        self._values_listeners: list[
+            Callable[[dict[EntityKey, Any]], None]
+        ] = []
+        self._entity_listeners: dict[
+            EntityKey, list[Callable[[Any], None]]
+        ] = {}
+        self._changed: dict[EntityKey, Any] = {}
+        self._pending: dict[tuple[str, ...], tuple[Decoder, bytes]] = {}
+        self._pending_since = 0.0
+        self._dispatch_handle: asyncio.Handle | None = None
+        self._has_new_entities = False
+        self.throttle = PublishThrottle(self._publish)
+        self.throttle.set_policy(
+            SIGNAL_STRENGTH.device_class.value,
+            PublishPolicy(RSSI_PUBLISH_DEADBAND, RSSI_PUBLISH_INTERVAL),
+        )
+        # Current values, indexed by the model's slot for each key
+        self._values: list[Any] = [_MISSING] * len(self.model.slots)
         self.bt_name = None
         self.address = None
-        self.entity_data = {}
         self.closed = False
 
-        for probe_num in range(1, self.num_probes + 1):
-            temp_char_name = "PROBE{}_TEMPERATURE".format(probe_num)
-            temp_char = getattr(UUIDS, temp_char_name)
-            self.temp_chars[temp_char] = probe_num
-            temp_threshold_name = "PROBE{}_THRESHOLD".format(probe_num)
-            temp_char = getattr(UUIDS, temp_threshold_name)
-            self.temp_threshold_chars[probe_num] = temp_char
+    @property
+    def name(self) -> str:
+        return self.model.name
+
+    @property
+    def num_probes(self) -> int:
+        return self.model.num_probes
+
+    @property
+    def has_battery(self) -> bool:
+        return self.model.has_battery
+
+    @property
+    def has_heating_element(self) -> bool:
+        return self.model.has_heating_element
+
+    @property
+    def has_propane(self) -> bool:
+        return self.model.has_propane
+
+    @property
+    def has_led_knob_light(self) -> bool:
+        return self.model.has_led_knob_light
+
+    @property
+    def probe_chars(self) -> Mapping[int, str]:
+        return self.model.probe_chars
+
+    @property
+    def temp_chars(self) -> Mapping[str, int]:
+        return self.model.temp_chars
+
+    @property
+    def temp_threshold_chars(self) -> Mapping[int, str]:
+        return self.model.temp_threshold_chars
 
     @callback
     def async_add_listener(
@@ -115,166 +357,656 @@ class IDevicePeripheral(BluetoothData):
         self._listeners.append(update_callback)
         return remove_listener
 
-    async def set_led_state(self, ble_device: BLEDevice):
-        if self.client and self.has_led_knob_light:
-            await self.client.write_gatt_char(UUIDS.LED_KNOB_TOGGLE, [1])
+    @callback
+    def async_add_entity_listener(
+        self,
+        entity_key: EntityKey,
+        update_callback: Callable[[Any], None],
+    ) -> Callable[[], None]:
+        """Listen for value changes of a single entity."""
+        listeners = self._entity_listeners.setdefault(entity_key, [])
+
+        @callback
+        def remove_listener() -> None:
+            """Remove entity listener."""
+            listeners.remove(update_callback)
+
+        listeners.append(update_callback)
+        return remove_listener
+
+    @callback
+    def async_add_values_listener(
+        self,
+        values_callback: Callable[[dict[EntityKey, Any]], None],
+    ) -> Callable[[], None]:
+        """
+        Listen for every batch of changed values, before any publish policy is applied.
+        Called from the notification path, so listeners must not block.
+        """
+
+        @callback
+        def remove_listener() -> None:
+            """Remove values listener."""
+            self._values_listeners.remove(values_callback)
+
+        self._values_listeners.append(values_callback)
+        return remove_listener
+
+    @callback
+    def async_add_capabilities_listener(
+        self,
+        capabilities_callback: Callable[[dict], None],
+    ) -> Callable[[], None]:
+        """Listen for the capability cache being rebuilt, so it can be persisted."""
+
+        @callback
+        def remove_listener() -> None:
+            """Remove capabilities listener."""
+            self._capabilities_listeners.remove(capabilities_callback)
+
+        self._capabilities_listeners.append(capabilities_callback)
+        return remove_listener
+
+    @callback
+    def async_add_disconnect_listener(
+        self,
+        disconnect_callback: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Listen for the connection to the device being lost."""
+
+        @callback
+        def remove_listener() -> None:
+            """Remove disconnect listener."""
+            self._disconnect_listeners.remove(disconnect_callback)
+
+        self._disconnect_listeners.append(disconnect_callback)
+        return remove_listener
+
+    async def _async_write_now(self, char: str, data: bytes):
+        if not self.client:
+            raise ConnectionError(f"{self.address} is not connected")
+        await self.client.write_gatt_char(self._handle(char), data, response=True)
+
+    async def set_led_state(self, on: bool):
+        """
+        Switch the knob light of models that have one. The grill only toggles it,
+        when 1 is written, so it is toggled from the state last set, off if none was.
+        """
+        if not self.has_led_knob_light:
+            raise ValueError(f"{self.name} has no knob light")
+        # Toggles must not be coalesced, each decides from the state the last one left
+        async with self._led_lock:
+            if on != bool(self.led_on):
+                await self.writes.async_write(UUIDS.LED_KNOB_TOGGLE, b"\x01")
+            self.led_on = on
 
     def _on_disconnect(self, device):
         self.client = None
+        self.metrics.disconnect_reasons[self._disconnect_reason or "link_lost"] += 1
+        self._disconnect_reason = None
+        if self._grace_handle:
+            self._grace_handle.cancel()
+            self._grace_handle = None
+        if self.availability_grace and not self.closed:
+            # Brief link drops keep the last values available, a reconnect within
+            # the grace window never touches the entities
+            self._grace_handle = asyncio.get_running_loop().call_later(
+                self.availability_grace, self._on_grace_expired
+            )
+        else:
+            self.refresh_availability()
+        for listener in self._disconnect_listeners:
+            listener()
+
+    def _on_grace_expired(self):
+        self._grace_handle = None
+        self.refresh_availability()
+
+    def refresh_availability(self) -> bool:
+        """
+        Write every entity once if the device's availability changed since the last
+        refresh, so the whole device transitions together. Returns whether it did.
+        """
+        available = self.available
+        if available == self._published_available:
+            return False
+        self._published_available = available
+        self.metrics.counters[
+            "became_available" if available else "became_unavailable"
+        ] += 1
+        self.update_all_listeners()
+        return True
+
+    def update_value(self, description, value, key=None):
+        """Store a new sensor value and queue it for dispatch."""
+        key = key or description.device_class.value
+        self._set_value(description, EntityKey(key, None), key, value)
+
+    def update_rssi(self, rssi: float):
+        """Publish the smoothed signal strength of the device's advertisements, if it changed."""
+        rssi = round(rssi)
+        if self.get_data(_SIGNAL_STRENGTH_KEY) == rssi:
+            # Advertisements arrive every second, most of them at the same strength
+            return
+        self.update_value(SIGNAL_STRENGTH, rssi)
         self.update_listeners()
 
-    def update_listeners(self):
-        data = self._finish_update()
-        for listener in self._listeners:
-            listener(data)
+    def update_decoded(self, decoder: Decoder, payload):
+        """Decode a characteristic payload straight into its sensor values."""
+        for entity_key, key, value in zip(
+            decoder.entity_keys, decoder.keys, decoder.decode(payload)
+        ):
+            self._set_value(decoder.description, entity_key, key, value)
+
+    def _set_value(self, description, entity_key, key, value):
+        slot = self.model.slots[entity_key]
+        previous = self._values[slot]
+        if previous is _MISSING:
+            # Only new keys need a description for the entity creation snapshot
+            self._has_new_entities = True
+            self._descriptions[DeviceKey(key)] = _sensor_description(key, description)
+        elif (
+            value != previous
+            and description.device_class is SensorDeviceClass.TEMPERATURE
+        ):
+            self.last_temp_change = time.monotonic()
+        if description.device_class is SensorDeviceClass.TEMPERATURE:
+            self.history.record(key, value)
+            if predictor := self.predictors.get(key):
+                self._update_prediction(key, predictor, value)
+                if key in self.thresholds:
+                    self._check_threshold(key, value)
+        self._values[slot] = value
+        self._changed[entity_key] = value
+
+    def _update_prediction(self, key: str, predictor: ProbePredictor, value):
+        if not value:
+            # Unplugged probe, the next cook starts from scratch
+            predictor.reset()
+        else:
+            predictor.add(time.monotonic(), value)
+        self._publish_prediction(key, predictor)
+
+    def _publish_prediction(self, key: str, predictor: ProbePredictor):
+        """Queue the derived rate (per minute) and ETA (minutes) of a probe for dispatch."""
+        rate = None if predictor.rate is None else round(predictor.rate * 60, 2)
+        eta = None if predictor.eta is None else round(predictor.eta / 60)
+        for entity_key, derived in (
+            (EntityKey(f"{key}_rate", None), rate),
+            (EntityKey(f"{key}_eta", None), eta),
+        ):
+            self._values[self.model.slots[entity_key]] = derived
+            self._changed[entity_key] = derived
+
+    def _check_threshold(self, key: str, value):
+        """Fire threshold listeners when a probe crosses its threshold, with hysteresis."""
+        threshold = self.thresholds[key]
+        reached = self._threshold_reached.get(key, False)
+        if not reached and value >= threshold:
+            reached = True
+        elif reached and value < threshold - THRESHOLD_HYSTERESIS:
+            reached = False
+        else:
+            return
+        self._threshold_reached[key] = reached
+        for listener in self._threshold_listeners:
+            listener(key, value, threshold, reached)
+
+    @callback
+    def async_add_threshold_listener(
+        self,
+        threshold_callback: Callable[[str, float, float, bool], None],
+    ) -> Callable[[], None]:
+        """Listen for probes reaching, or dropping back below, their threshold."""
+
+        @callback
+        def remove_listener() -> None:
+            """Remove threshold listener."""
+            self._threshold_listeners.remove(threshold_callback)
+
+        self._threshold_listeners.append(threshold_callback)
+        return remove_listener
 
-    def update_temp_sensor(self, payload, name):
-        temp = payload[0] + (payload[1] * 256)
-        temp = float(temp) if float(temp) != 63536.0 else 0
-        temp_unit = SensorLibrary.TEMPERATURE__CELSIUS
-        self.update_predefined_sensor(temp_unit, temp, name)
+    async def async_set_probe_threshold(self, key: str, threshold: float | None):
+        """
+        Set the target temperature of a probe, None or 0 clearing it. The target is
+        written to the device's threshold, evaluated locally for alarms and used for
+        the probe's ETA.
+        """
+        predictor = self.predictors[key]
+        if threshold:
+            self.thresholds[key] = threshold
+        else:
+            threshold = None
+            self.thresholds.pop(key, None)
+        self._threshold_reached.pop(key, None)
+        target_key = EntityKey(f"{key}_target", None)
+        self._values[self.model.slots[target_key]] = threshold or 0
+        self._changed[target_key] = threshold or 0
+        predictor.set_target(threshold)
+        self._publish_prediction(key, predictor)
         self.update_listeners()
+        if self.client:
+            await self._async_write_threshold(key)
 
-    def update_heating_sensor(self, payload):
-        payload = [float(x) for x in payload.decode("utf-8").split()]
-        self.update_predefined_sensor(
-            SensorLibrary.TEMPERATURE__CELSIUS,
-            payload[0],
-            "heating_element_left_actual",
-        )
-        self.update_predefined_sensor(
-            SensorLibrary.TEMPERATURE__CELSIUS,
-            payload[1],
-            "heating_element_right_actual",
-        )
-        self.update_predefined_sensor(
-            SensorLibrary.TEMPERATURE__CELSIUS,
-            payload[2],
-            "heating_element_left_setpoint",
+    async def _async_write_threshold(self, key: str):
+        probe_num = int(key.rsplit("_", 1)[1])
+        await self.writes.async_write(
+            self.temp_threshold_chars[probe_num],
+            encode_temperature(self.thresholds.get(key, 0)),
         )
-        self.update_predefined_sensor(
-            SensorLibrary.TEMPERATURE__CELSIUS,
-            payload[3],
-            "heating_element_right_setpoint",
-        )
-        self.update_listeners()
 
-    def update_propane_sensor(self, payload):
-        val = float(payload[0]) * 25
-        self.update_predefined_sensor(
-            BaseSensorDescription(
-                device_class=SensorDeviceClass.GAS,
-                native_unit_of_measurement=Units.PERCENTAGE,
-            ),
-            val,
-            "propane_percentage",
+    def _snapshot(self) -> SensorUpdate:
+        """Every value seen so far with its description, for creating their entities."""
+        return SensorUpdate(
+            title=None,
+            devices={None: self.device_info},
+            entity_descriptions=dict(self._descriptions),
+            entity_values={
+                device_key: SensorValue(
+                    name=device_key.key.replace("_", " ").title(),
+                    device_key=device_key,
+                    native_value=self.get_data(EntityKey(device_key.key, None)),
+                )
+                for device_key in self._descriptions
+            },
         )
-        self.update_listeners()
 
-    def update_battery_sensor(self, payload):
-        self.update_predefined_sensor(SensorLibrary.BATTERY__PERCENTAGE, payload[0])
-        self.update_listeners()
+    def update_listeners(self, publish: bool = True):
+        """
+        Dispatch queued value changes to the entities subscribed to them.
+        A full snapshot is only built when new entities need to be created, after that
+        entities read current values via get_data. With publish False the entities
+        were just written in full, the changes are only recorded as published.
+        """
+        changed, self._changed = self._changed, {}
+        if self._has_new_entities:
+            self._has_new_entities = False
+            data = self._snapshot()
+            for listener in self._listeners:
+                listener(data)
+        for listener in self._values_listeners:
+            listener(changed)
+        if not publish:
+            for entity_key, value in changed.items():
+                self.throttle.record_published(entity_key, value)
+            return
+        should_publish = self.throttle.should_publish
+        for entity_key, value in changed.items():
+            if should_publish(entity_key, value):
+                self._publish(entity_key, value)
+
+    def _publish(self, entity_key: EntityKey, value):
+        listeners = self._entity_listeners.get(entity_key)
+        if listeners:
+            start = time.perf_counter()
+            for listener in listeners:
+                listener(value)
+            self.metrics.listener_time.record(time.perf_counter() - start)
+
+    def set_temperature_policy(self, policy: PublishPolicy):
+        """Apply a publish policy to the probe and ambient temperatures."""
+        for probe_num in self.probe_chars:
+            self.throttle.set_policy(f"probe_{probe_num}", policy)
+        self.throttle.set_policy("ambient_temp", policy)
+
+    def update_all_listeners(self):
+        """Push the current value to every entity, e.g. after availability changes."""
+        for entity_key, listeners in self._entity_listeners.items():
+            value = self.get_data(entity_key)
+            for listener in listeners:
+                listener(value)
 
     async def close(self):
         self.closed = True
-        if self.client:
-            await self.client.disconnect()
-            self.client = None
-
-    def get_data(self, key: PassiveBluetoothEntityKey):
-        return self.entity_data[key].native_value
-
-    async def start_notify_temp(self, char, name):
-        await self.client.start_notify(
-            char,
-            lambda handle, payload: self.update_temp_sensor(
-                payload, name
-            ),
-        )
-        self.update_temp_sensor(
-            await self.client.read_gatt_char(char), name
+        self.throttle.cancel()
+        self.writes.cancel()
+        if self._grace_handle:
+            self._grace_handle.cancel()
+            self._grace_handle = None
+        if self._dispatch_handle:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+            self._pending = {}
+        await self.async_disconnect()
+
+    @property
+    def available(self) -> bool:
+        """
+        Connected, disconnected for less than the availability grace, or in low duty
+        mode polled recently enough to still be current.
+        """
+        if self.client and self.client.is_connected or self._grace_handle:
+            return True
+        return self.poll_deadline is not None and time.monotonic() < self.poll_deadline
+
+    def get_data(self, key: EntityKey):
+        slot = self.model.slots.get(key)
+        if slot is None:
+            return None
+        value = self._values[slot]
+        return None if value is _MISSING else value
+
+    def diagnostics(self) -> dict:
+        """Connection state, capabilities and instrumentation for the diagnostics download."""
+        return {
+            "name": self.name,
+            "connected": bool(self.client and self.client.is_connected),
+            "firmware": self.firmware,
+            "authenticated": self.authenticated,
+            "capabilities": self.capabilities,
+            "published_updates": self.throttle.published,
+            "suppressed_updates": self.throttle.suppressed,
+            "metrics": self.metrics.as_dict(),
+            "history": {
+                "keys": list(self.history.buffers),
+                "bytes": self.history.nbytes,
+            },
+        }
+
+    def _on_notification(self, decoder: Decoder, _sender, payload):
+        """
+        Queue a payload for the next dispatch. The queue holds one payload per
+        characteristic, so it is bounded by their number and a burst of notifications
+        for the same one only keeps the latest.
+        """
+        pending = self._pending
+        if decoder.keys in pending:
+            self.metrics.counters["merged_notifications"] += 1
+        pending[decoder.keys] = (decoder, payload)
+        if self._dispatch_handle is None:
+            self._pending_since = time.perf_counter()
+            self._dispatch_handle = asyncio.get_running_loop().call_soon(
+                self._dispatch
+            )
+
+    def _dispatch(self):
+        """Decode and publish everything queued since the last dispatch as one update."""
+        start = time.perf_counter()
+        pending, self._pending = self._pending, {}
+        self._dispatch_handle = None
+        metrics = self.metrics
+        metrics.dispatch_lag.record(start - self._pending_since)
+        metrics.peak_dispatch_depth = max(metrics.peak_dispatch_depth, len(pending))
+        for decoder, payload in pending.values():
+            try:
+                self.update_decoded(decoder, payload)
+            except ValueError as err:
+                # One malformed notification shouldn't hold back the others
+                _LOGGER.debug("%s sent a malformed payload: %s", self.address, err)
+                metrics.counters["malformed_payloads"] += 1
+        self.update_listeners()
+        # From the batch's first notification until the entities were written
+        metrics.notification_latency.record(time.perf_counter() - self._pending_since)
+
+    def load_capabilities(self, capabilities: dict | None):
+        """Restore a capability cache previously produced by _async_probe_capabilities."""
+        self.capabilities = capabilities
+        if capabilities:
+            self.has_ambient_temp = capabilities["ambient"]
+
+    async def _async_probe_capabilities(self, firmware: str) -> dict:
+        """Discover which of the model's characteristics this device exposes."""
+        services = await self.client.get_services()
+        handles = {}
+        for char in (
+            *self.temp_chars,
+            *self.temp_threshold_chars.values(),
+            UUIDS.AMBIENT_TEMPERATURE,
+            UUIDS.HEATING_ELEMENTS,
+            UUIDS.BATTERY_LEVEL,
+            UUIDS.PROPANE_LEVEL,
+            UUIDS.LED_KNOB_TOGGLE,
+        ):
+            characteristic = services.get_characteristic(char)
+            if characteristic:
+                handles[char.lower()] = characteristic.handle
+        return {
+            "firmware": firmware,
+            "probes": [
+                probe_num
+                for char, probe_num in self.temp_chars.items()
+                if char.lower() in handles
+            ],
+            "ambient": UUIDS.AMBIENT_TEMPERATURE.lower() in handles,
+            "heating_element": self.has_heating_element
+            and UUIDS.HEATING_ELEMENTS.lower() in handles,
+            "battery": self.has_battery and UUIDS.BATTERY_LEVEL.lower() in handles,
+            "propane": self.has_propane and UUIDS.PROPANE_LEVEL.lower() in handles,
+            "led_knob": self.has_led_knob_light
+            and UUIDS.LED_KNOB_TOGGLE.lower() in handles,
+            "handles": handles,
+        }
+
+    def _handle(self, char):
+        """Resolve a characteristic uuid to its cached handle, if known."""
+        if not self.capabilities:
+            return char
+        return self.capabilities["handles"].get(char.lower(), char)
+
+    def _sensor_chars(self):
+        """
+        Characteristics reporting sensor values, as found by capability discovery or,
+        before the device has ever been connected, as expected from its model.
+        """
+        capabilities = self.capabilities or {
+            "probes": list(self.probe_chars),
+            "ambient": self.has_ambient_temp,
+            "heating_element": self.has_heating_element,
+            "battery": self.has_battery,
+            "propane": self.has_propane,
+        }
+        chars = [self.probe_chars[probe_id] for probe_id in capabilities["probes"]]
+        if capabilities["ambient"]:
+            chars.append(UUIDS.AMBIENT_TEMPERATURE)
+        if capabilities["heating_element"]:
+            chars.append(UUIDS.HEATING_ELEMENTS)
+        if capabilities["battery"]:
+            chars.append(UUIDS.BATTERY_LEVEL)
+        if capabilities["propane"]:
+            chars.append(UUIDS.PROPANE_LEVEL)
+        return chars
+
+    def sensor_descriptions(self):
+        """Keys and descriptions of every sensor value the device is expected to report."""
+        descriptions = [(SIGNAL_STRENGTH.device_class.value, SIGNAL_STRENGTH)]
+        for char in self._sensor_chars():
+            decoder = DECODERS[char.lower()]
+            descriptions.extend((key, decoder.description) for key in decoder.keys)
+        return descriptions
+
+    def _subscriptions(self):
+        """Characteristics to subscribe to, along with the decoder for their payloads."""
+        return [
+            (self._handle(char), DECODERS[char.lower()]) for char in self._sensor_chars()
+        ]
+
+    async def _async_setup_subscriptions(self, subscriptions, notify=True):
+        """
+        Subscribe to and read every characteristic with bounded concurrency, or only
+        read them when notify is False.
+        The first failure in subscription order is raised, and the initial readings
+        are only published once, as a single combined update, when all have succeeded.
+        """
+        client = self.client
+        semaphore = asyncio.Semaphore(SUBSCRIBE_CONCURRENCY)
+
+        async def setup(char, decoder):
+            async with semaphore:
+                if notify:
+                    await client.start_notify(
+                        char, functools.partial(self._on_notification, decoder)
+                    )
+                return await client.read_gatt_char(char)
+
+        results = await asyncio.gather(
+            *(setup(*subscription) for subscription in subscriptions),
+            return_exceptions=True,
         )
-    async def async_init(self, ble_device: BLEDevice) -> SensorUpdate:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for (char, decoder), payload in zip(subscriptions, results):
+            self.update_decoded(decoder, payload)
+        # Becoming available writes every entity with its current value, the changed
+        # ones included, so they aren't also written one by one
+        pushed = self.refresh_availability()
+        self.update_listeners(publish=not pushed)
+
+    async def async_connect(self, ble_device: BLEDevice):
         """
-        Connect to the igrill, receive initial data and then set up listeners to update info async.
+        Establish the GATT connection to the igrill.
         """
         self.bt_name = ble_device.name
         self.address = ble_device.address
-        if not self.client and not self.closed:
-            self.client = await establish_connection(
-                BleakClient, ble_device, ble_device.address, lambda device: self._on_disconnect(device)
-            )
-            await self.client.pair(protection_level=1)
-
-            # send app challenge (16 bytes) (must be wrapped in a bytearray)
-            challenge = bytes(b"\0" * 16)
-            await self.client.write_gatt_char(UUIDS.APP_CHALLENGE, challenge)
-
-            # Normally we'd have to perform some crypto operations:
-            #     Write a challenge (in this case 16 bytes of 0)
-            #     Read the value
-            #     Decrypt w/ the key
-            #     Check the first 8 bytes match our challenge
-            #     Set the first 8 bytes 0
-            #     Encrypt with the key
-            #     Send back the new value
-            # But wait!  Our first 8 bytes are already 0.  That means we don't need the key.
-            # We just hand back the same encrypted value we get and we're good.
-            encrypted_device_challenge = await self.client.read_gatt_char(
-                UUIDS.DEVICE_CHALLENGE
-            )
-            await self.client.write_gatt_char(
-                UUIDS.DEVICE_RESPONSE, encrypted_device_challenge
-            )
+        from bleak_retry_connector import establish_connection
 
-            if not self.retrieved_device_info:
-                self.retrieved_device_info = True
-                self.set_device_manufacturer("Weber")
-                self.set_device_type(self.name)
-                payload = await self.client.read_gatt_char(UUIDS.FIRMWARE_VERSION)
-                self.set_device_sw_version(payload.rstrip(b"\x00").decode("utf-8"))
-            for char, probe_id in self.temp_chars.items():
-                await self.start_notify_temp(char, f"probe_{probe_id}")
-
-            if (await self.client.get_services()).get_characteristic(
-                UUIDS.AMBIENT_TEMPERATURE
-            ):
-                self.has_ambient_temp = True
-                await self.client.start_notify(
-                    UUIDS.AMBIENT_TEMPERATURE,
-                    lambda handle, payload: self.update_temp_sensor(
-                        payload, "ambient_temp"
-                    ),
-                )
-                self.update_temp_sensor(
-                    await self.client.read_gatt_char(UUIDS.AMBIENT_TEMPERATURE),
-                    "ambient_temp",
-                )
+        client_class = self.client_class
+        if client_class is None:
+            from bleak import BleakClient
 
-            if self.has_heating_element:
-                await self.client.start_notify(
-                    UUIDS.HEATING_ELEMENTS,
-                    lambda handle, payload: self.update_heating_sensor(payload),
-                )
-                await self.update_heating_sensor(
-                    self.client.read_gatt_char(UUIDS.HEATING_ELEMENTS),
-                )
-            if self.has_battery:
-                await self.client.start_notify(
-                    UUIDS.BATTERY_LEVEL,
-                    lambda handle, payload: self.update_battery_sensor(payload),
-                )
-                payload = await self.client.read_gatt_char(UUIDS.BATTERY_LEVEL)
-                self.update_battery_sensor(payload)
-            if self.has_propane:
-                await self.client.start_notify(
-                    UUIDS.PROPANE_LEVEL,
-                    lambda handle, payload: self.update_propane_sensor(payload),
+            client_class = BleakClient
+        start = time.perf_counter()
+        self.client = await establish_connection(
+            client_class, ble_device, ble_device.address, lambda device: self._on_disconnect(device)
+        )
+        self.metrics.connect_time.record(time.perf_counter() - start)
+        counters = self.metrics.counters
+        counters["connects"] += 1
+        if counters["connects"] > 1:
+            counters["reconnects"] += 1
+
+    async def _async_handshake(self):
+        """
+        Pair and perform the challenge/response handshake required before any reads.
+        """
+        await self.client.pair(protection_level=1)
+
+        # send app challenge (16 bytes) (must be wrapped in a bytearray)
+        challenge = bytes(b"\0" * 16)
+        await self.client.write_gatt_char(UUIDS.APP_CHALLENGE, challenge)
+
+        # Normally we'd have to perform some crypto operations:
+        #     Write a challenge (in this case 16 bytes of 0)
+        #     Read the value
+        #     Decrypt w/ the key
+        #     Check the first 8 bytes match our challenge
+        #     Set the first 8 bytes 0
+        #     Encrypt with the key
+        #     Send back the new value
+        # But wait!  Our first 8 bytes are already 0.  That means we don't need the key.
+        # We just hand back the same encrypted value we get and we're good.
+        encrypted_device_challenge = await self.client.read_gatt_char(
+            UUIDS.DEVICE_CHALLENGE
+        )
+        await self.client.write_gatt_char(
+            UUIDS.DEVICE_RESPONSE, encrypted_device_challenge
+        )
+
+    async def _async_read_firmware(self) -> str:
+        payload = await self.client.read_gatt_char(UUIDS.FIRMWARE_VERSION)
+        return payload.rstrip(b"\x00").decode("utf-8")
+
+    async def async_authenticate(self):
+        """
+        Authenticate the connection and read the firmware version.
+        Once a device has been authenticated, reconnects first try to resume the bond
+        directly and only fall back to the full handshake if the device refuses the read.
+        A resumed attempt failing in any other way makes the next one handshake.
+        """
+        from bleak.exc import BleakError
+
+        start = time.monotonic()
+        resumed = False
+        if self.authenticated:
+            try:
+                self.firmware = await self._async_read_firmware()
+                resumed = True
+            except BleakError as err:
+                self.authenticated = False
+                if not _is_auth_error(err):
+                    raise
+                _LOGGER.debug(
+                    "%s rejected resumed session (%s), performing full handshake",
+                    self.address,
+                    err,
                 )
-                self.update_propane_sensor(
-                    await self.client.read_gatt_char(UUIDS.PROPANE_LEVEL),
+            except Exception:
+                self.authenticated = False
+                raise
+        self._session_resumed = resumed
+        if not resumed:
+            await self._async_handshake()
+            self.firmware = await self._async_read_firmware()
+            self.authenticated = True
+        self.handshake_time = time.monotonic() - start
+        self.metrics.handshake_time.record(self.handshake_time)
+        self.metrics.counters["resumed_sessions" if resumed else "full_handshakes"] += 1
+        _LOGGER.debug(
+            "%s %s in %.3fs",
+            self.address,
+            "resumed session" if resumed else "completed handshake",
+            self.handshake_time,
+        )
+
+    async def async_subscribe(self, notify=True):
+        """
+        Receive initial data and then set up listeners to update info async.
+        With notify False every value is read once and nothing is subscribed to.
+        A read refused for lack of authorization, or any failure on a resumed session,
+        means it wasn't accepted after all, so the next attempt performs the full
+        handshake.
+        """
+        from bleak.exc import BleakError
+
+        start = time.perf_counter()
+        firmware = self.firmware
+        if not self.retrieved_device_info:
+            self.retrieved_device_info = True
+            self.device_info.manufacturer = "Weber"
+            self.device_info.model = self.name
+        self.device_info.sw_version = firmware
+
+        try:
+            # A device's layout only changes with its firmware, so skip discovery otherwise
+            if not self.capabilities or self.capabilities["firmware"] != firmware:
+                self.load_capabilities(await self._async_probe_capabilities(firmware))
+                for listener in self._capabilities_listeners:
+                    listener(self.capabilities)
+            await self._async_setup_subscriptions(self._subscriptions(), notify)
+            # Thresholds set while disconnected are only stored locally until now. They
+            # can be set or cleared while these are written, each writes its latest
+            for key in list(self.thresholds):
+                await self._async_write_threshold(key)
+        except Exception as err:
+            if self._session_resumed or (
+                isinstance(err, BleakError) and _is_auth_error(err)
+            ):
+                _LOGGER.debug(
+                    "%s failed after authenticating (%s), next attempt "
+                    "performs the full handshake",
+                    self.address,
+                    err,
                 )
-        return self._finish_update()
+                self.authenticated = False
+            raise
+        self.metrics.subscribe_time.record(time.perf_counter() - start)
+
+    async def async_disconnect(self):
+        if self.client:
+            self._disconnect_reason = "closed" if self.closed else "requested"
+            client, self.client = self.client, None
+            await client.disconnect()
+
+    async def async_init(self, ble_device: BLEDevice) -> SensorUpdate:
+        """
+        Connect to the igrill, receive initial data and then set up listeners to update info async.
+        """
+        if not self.client and not self.closed:
+            await self.async_connect(ble_device)
+            await self.async_authenticate()
+            await self.async_subscribe()
+        return self._snapshot()
 
 
 class KitchenThermometerPeripheral(IDevicePeripheral):
@@ -282,6 +1014,8 @@ class KitchenThermometerPeripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the Weber Kitchen Thermometer
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "Kitchen Thermometer", 2)
 
@@ -291,6 +1025,8 @@ class KitchenThermometerMiniPeripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the Weber Kitchen Thermometer Mini
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "Kitchen Thermometer Mini", 1)
 
@@ -300,6 +1036,8 @@ class IGrillMini2Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the iGrill Mini 2
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "iGrill Mini 2", 1)
 
@@ -309,6 +1047,8 @@ class IGrillMiniPeripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the iGrill Mini
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "iGrill Mini", 1)
 
@@ -318,6 +1058,8 @@ class IGrillV22Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the iGrill v2 2
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "iGrill V2 2", 4)
 
@@ -327,6 +1069,8 @@ class IGrillV2Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the iGrill v2
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(self, "iGrill V2", 4)
 
@@ -336,6 +1080,8 @@ class IGrillV3Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the iGrill v3
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(
             self, "iGrill V3", 4, has_led_knob_light=True, has_propane=True
@@ -347,6 +1093,8 @@ class Pulse1000Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the Weber Pulse 1000
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(
             self, "Pulse 1000", 2, has_heating_element=True, has_battery=False
@@ -358,6 +1106,8 @@ class Pulse2000Peripheral(IDevicePeripheral):
     Specialization of iDevice peripheral for the Weber Pulse 2000
     """
 
+    __slots__ = ()
+
     def __init__(self):
         IDevicePeripheral.__init__(
             self, "Pulse 2000", 4, has_heating_element=True, has_battery=False
@@ -0,0 +1,97 @@
+"""Latency histograms and event counters for a device."""
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+
+# Upper bounds of the histogram buckets in seconds, the last bucket is unbounded
+BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """A fixed bucket histogram of durations in seconds."""
+
+    __slots__ = ("counts", "count", "total", "min", "max", "last")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+        self.last: float | None = None
+
+    def record(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+            "buckets": {
+                f"le_{bound}" if bound is not None else "inf": count
+                for bound, count in zip((*BUCKETS, None), self.counts)
+            },
+        }
+
+
+class DeviceMetrics:
+    """Everything measured about one device's connection and dispatch."""
+
+    def __init__(self) -> None:
+        self.connect_time = Histogram()
+        self.handshake_time = Histogram()
+        self.subscribe_time = Histogram()
+        self.notification_latency = Histogram()
+        self.dispatch_lag = Histogram()
+        self.peak_dispatch_depth = 0
+        self.listener_time = Histogram()
+        self.write_time = Histogram()
+        self.counters: Counter[str] = Counter()
+        self.disconnect_reasons: Counter[str] = Counter()
+
+    def as_dict(self) -> dict:
+        return {
+            "connect_time": self.connect_time.as_dict(),
+            "handshake_time": self.handshake_time.as_dict(),
+            "subscribe_time": self.subscribe_time.as_dict(),
+            "notification_latency": self.notification_latency.as_dict(),
+            "dispatch_lag": self.dispatch_lag.as_dict(),
+            "peak_dispatch_depth": self.peak_dispatch_depth,
+            "listener_time": self.listener_time.as_dict(),
+            "write_time": self.write_time.as_dict(),
+            "counters": dict(self.counters),
+            "disconnect_reasons": dict(self.disconnect_reasons),
+        }
@@ -0,0 +1,82 @@
+"""Probe target temperatures for iGrill devices."""
+from __future__ import annotations
+
+from bleak.exc import BleakError
+from homeassistant.components.bluetooth.passive_update_processor import (
+    PassiveBluetoothEntityKey,
+)
+from homeassistant.components.number import NumberMode, RestoreNumber
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TEMP_CELSIUS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .catalog import EntityCatalog, key_name
+from .const import DATA_CATALOGS, DOMAIN
+from .igrill import IDevicePeripheral
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up IGrill probe targets."""
+    igrill: IDevicePeripheral = hass.data[DOMAIN][entry.entry_id]
+    catalog: EntityCatalog = hass.data[DOMAIN][DATA_CATALOGS][entry.entry_id]
+    async_add_entities(
+        [
+            IGrillProbeTargetEntity(igrill, probe_key, catalog)
+            for probe_key in catalog.probes
+        ]
+    )
+
+
+class IGrillProbeTargetEntity(RestoreNumber):
+    """The target temperature of a probe, 0 meaning no target."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_mode = NumberMode.BOX
+    _attr_native_min_value = 0
+    _attr_native_max_value = 300
+    _attr_native_step = 1
+    _attr_native_unit_of_measurement = TEMP_CELSIUS
+
+    def __init__(
+        self, data: IDevicePeripheral, probe_key: str, catalog: EntityCatalog
+    ) -> None:
+        self.data = data
+        self.probe_key = probe_key
+        self._attr_name = f"{key_name(probe_key)} target"
+        self._attr_unique_id = catalog.unique_id(f"{probe_key}_target")
+        self._attr_device_info = catalog.device_info
+
+    @property
+    def native_value(self) -> float:
+        return self.data.thresholds.get(self.probe_key, 0)
+
+    @callback
+    def update(self, value) -> None:
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.data.async_add_entity_listener(
+                PassiveBluetoothEntityKey(f"{self.probe_key}_target", None),
+                self.update,
+            )
+        )
+        last_number_data = await self.async_get_last_number_data()
+        if last_number_data and last_number_data.native_value:
+            await self.data.async_set_probe_threshold(
+                self.probe_key, last_number_data.native_value
+            )
+
+    async def async_set_native_value(self, value: float) -> None:
+        try:
+            await self.data.async_set_probe_threshold(self.probe_key, value)
+        except (BleakError, ConnectionError) as err:
+            raise HomeAssistantError(str(err)) from err
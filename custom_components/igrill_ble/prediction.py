@@ -0,0 +1,132 @@
+"""Streaming cook time prediction from probe temperatures."""
+from __future__ import annotations
+
+import math
+
+from .const import (
+    PREDICTION_HALF_LIFE,
+    PREDICTION_MIN_SAMPLES,
+    STALL_MAX_RATE,
+    STALL_RANGE,
+)
+
+
+class _WeightedRegression:
+    """
+    Exponentially weighted least squares of y on x, updated in O(1) per sample with a
+    weighted Welford update so no history needs to be kept or refitted.
+    """
+
+    __slots__ = ("weight", "mean_x", "mean_y", "cov_xx", "cov_xy")
+
+    def __init__(self) -> None:
+        self.weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cov_xx = 0.0
+        self.cov_xy = 0.0
+
+    def add(self, x: float, y: float, decay: float) -> None:
+        self.weight = self.weight * decay + 1.0
+        self.cov_xx *= decay
+        self.cov_xy *= decay
+        alpha = 1.0 / self.weight
+        dx = x - self.mean_x
+        self.mean_x += alpha * dx
+        self.mean_y += alpha * (y - self.mean_y)
+        self.cov_xx += dx * (x - self.mean_x)
+        self.cov_xy += dx * (y - self.mean_y)
+
+    @property
+    def slope(self) -> float | None:
+        return self.cov_xy / self.cov_xx if self.cov_xx > 1e-9 else None
+
+    @property
+    def intercept(self) -> float | None:
+        slope = self.slope
+        return None if slope is None else self.mean_y - slope * self.mean_x
+
+
+class ProbePredictor:
+    """
+    Estimates the heating rate of one probe and when it will reach its target.
+
+    A linear fit of temperature over time gives the current rate. A second fit of
+    that rate against temperature models Newton's law of heating, rate = a + b * T,
+    whose asymptote -a / b gives an exponential ETA while the probe is still heating
+    towards it. Slow heating inside the stall range is reported as a stall instead.
+    """
+
+    __slots__ = (
+        "target",
+        "rate",
+        "eta",
+        "stalled",
+        "samples",
+        "_half_life",
+        "_last_time",
+        "_temperature",
+        "_linear",
+        "_heating",
+    )
+
+    def __init__(self, half_life: float = PREDICTION_HALF_LIFE) -> None:
+        self.target: float | None = None
+        self._half_life = half_life
+        self.reset()
+
+    def reset(self) -> None:
+        self.rate: float | None = None
+        self.eta: float | None = None
+        self.stalled = False
+        self.samples = 0
+        self._last_time: float | None = None
+        self._temperature: float | None = None
+        self._linear = _WeightedRegression()
+        self._heating = _WeightedRegression()
+
+    def set_target(self, target: float | None) -> None:
+        self.target = target
+        if self.rate is not None:
+            self.eta = self._estimate()
+
+    def add(self, timestamp: float, temperature: float) -> None:
+        """Feed one sample, timestamp in seconds."""
+        if self._last_time is None:
+            decay = 1.0
+        elif timestamp <= self._last_time:
+            return
+        else:
+            decay = 0.5 ** ((timestamp - self._last_time) / self._half_life)
+        self._last_time = timestamp
+        self._temperature = temperature
+        self.samples += 1
+        self._linear.add(timestamp, temperature, decay)
+        rate = self._linear.slope
+        if rate is None or self.samples < PREDICTION_MIN_SAMPLES:
+            return
+        self.rate = rate
+        self._heating.add(temperature, rate, decay)
+        self.stalled = (
+            STALL_RANGE[0] <= temperature <= STALL_RANGE[1]
+            and abs(rate) < STALL_MAX_RATE
+        )
+        self.eta = self._estimate()
+
+    def _estimate(self) -> float | None:
+        """Seconds until the target is reached, if it is being approached."""
+        target, temperature, rate = self.target, self._temperature, self.rate
+        if target is None or self.stalled:
+            return None
+        if temperature >= target:
+            return 0.0
+        if rate <= 0:
+            return None
+        coefficient = self._heating.slope
+        if coefficient is not None and coefficient < 0:
+            asymptote = -self._heating.intercept / coefficient
+            if asymptote > target:
+                return math.log(
+                    (asymptote - temperature) / (asymptote - target)
+                ) / -coefficient
+        return (target - temperature) / rate
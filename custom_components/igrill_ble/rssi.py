@@ -0,0 +1,75 @@
+"""Signal strength tracking from advertisements."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import RSSI_MIN_CONNECT, RSSI_SMOOTHING, RSSI_STALE, RSSI_TREND_MARGIN
+
+
+class SourceRssi:
+    """Smoothed RSSI and its trend, in dBm per advertisement, as seen by one scanner."""
+
+    __slots__ = ("device", "smoothed", "trend", "last_seen")
+
+    def __init__(self, device: Any, rssi: float, now: float) -> None:
+        self.device = device
+        self.smoothed = float(rssi)
+        self.trend = 0.0
+        self.last_seen = now
+
+    def add(self, device: Any, rssi: float, now: float, alpha: float) -> None:
+        previous = self.smoothed
+        self.device = device
+        self.smoothed += alpha * (rssi - previous)
+        self.trend += alpha * (self.smoothed - previous - self.trend)
+        self.last_seen = now
+
+
+class RssiTracker:
+    """
+    Exponentially smoothed RSSI of one device per scanner (adapter or proxy) that
+    has recently seen it, used to pick the scanner to connect through and to hold
+    off on connecting while the signal is too weak for an attempt to succeed.
+    """
+
+    def __init__(
+        self,
+        alpha: float = RSSI_SMOOTHING,
+        min_rssi: float = RSSI_MIN_CONNECT,
+        trend_margin: float = RSSI_TREND_MARGIN,
+        stale: float = RSSI_STALE,
+    ) -> None:
+        self.alpha = alpha
+        self.min_rssi = min_rssi
+        self.trend_margin = trend_margin
+        self.stale = stale
+        self.sources: dict[str | None, SourceRssi] = {}
+
+    def add(self, source: str | None, device: Any, rssi: float | None, now: float) -> None:
+        if rssi is None:
+            return
+        if (entry := self.sources.get(source)) is None:
+            self.sources[source] = SourceRssi(device, rssi, now)
+        else:
+            entry.add(device, rssi, now, self.alpha)
+
+    def best(self, now: float) -> tuple[str | None, SourceRssi] | None:
+        """The scanner with the strongest smoothed signal, dropping ones that lost the device."""
+        best = None
+        for source, entry in list(self.sources.items()):
+            if now - entry.last_seen > self.stale:
+                del self.sources[source]
+            elif best is None or entry.smoothed > best[1].smoothed:
+                best = (source, entry)
+        return best
+
+    def connectable(self, entry: SourceRssi | None) -> bool:
+        """
+        Whether a connection attempt is worth making, either because the signal is
+        strong enough or because it is close to it and improving.
+        """
+        if entry is None:
+            return True
+        if entry.smoothed >= self.min_rssi:
+            return True
+        return entry.smoothed >= self.min_rssi - self.trend_margin and entry.trend > 0
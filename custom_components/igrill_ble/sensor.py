@@ -1,140 +1,97 @@
 """Support for displaying collected data over SNMP."""
 import logging
-from homeassistant.components.bluetooth.passive_update_processor import (
-    PassiveBluetoothDataUpdate,
-    PassiveBluetoothEntityKey,
-    PassiveBluetoothProcessorEntity,
-)
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    ATTR_HW_VERSION,
-    ATTR_IDENTIFIERS,
-    ATTR_MANUFACTURER,
-    ATTR_MODEL,
-    ATTR_NAME,
-    ATTR_SW_VERSION,
-    PERCENTAGE,
-    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    TEMP_CELSIUS,
-    TEMP_FAHRENHEIT,
-)
+from homeassistant.const import TIME_MILLISECONDS
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo, EntityDescription
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.sensor import (
-    SensorDeviceClass,
+    RestoreSensor,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
+from homeassistant.helpers.typing import StateType
 
+from .catalog import CatalogEntry, EntityCatalog
 from .igrill import IDevicePeripheral
-from .const import DOMAIN
-
-from sensor_state_data import (
-    DeviceClass,
-    DeviceKey,
-    SensorDeviceInfo,
-    SensorUpdate,
-    Units,
+from .const import (
+    ATTR_TARGET_TEMPERATURE,
+    DATA_CATALOGS,
+    DOMAIN,
+    SERVICE_SET_PROBE_TARGET,
 )
 
+from sensor_state_data import SensorUpdate
+
 _LOGGER = logging.getLogger(__name__)
 
-SENSOR_DESCRIPTIONS = {
-    (DeviceClass.TEMPERATURE, Units.TEMP_FAHRENHEIT): SensorEntityDescription(
-        key=f"{DeviceClass.TEMPERATURE}_{Units.TEMP_CELSIUS}",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=TEMP_FAHRENHEIT,
-        state_class=SensorStateClass.MEASUREMENT,
+@dataclass
+class IGrillDiagnosticEntityDescription(SensorEntityDescription):
+    """Describes a sensor reporting one of the device's own metrics."""
+
+    value_fn: Callable[[IDevicePeripheral], StateType] | None = None
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+DIAGNOSTIC_DESCRIPTIONS = (
+    IGrillDiagnosticEntityDescription(
+        key="connect_time",
+        name="Connect time",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        value_fn=lambda igrill: _milliseconds(igrill.metrics.connect_time.last),
     ),
-    (DeviceClass.TEMPERATURE, Units.TEMP_CELSIUS): SensorEntityDescription(
-        key=f"{DeviceClass.TEMPERATURE}_{Units.TEMP_CELSIUS}",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=TEMP_CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
+    IGrillDiagnosticEntityDescription(
+        key="handshake_time",
+        name="Handshake time",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        value_fn=lambda igrill: _milliseconds(igrill.metrics.handshake_time.last),
     ),
-    (DeviceClass.BATTERY, Units.PERCENTAGE): SensorEntityDescription(
-        key=f"{DeviceClass.BATTERY}_{Units.PERCENTAGE}",
-        device_class=SensorDeviceClass.BATTERY,
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
+    IGrillDiagnosticEntityDescription(
+        key="subscribe_time",
+        name="Subscription setup time",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        value_fn=lambda igrill: _milliseconds(igrill.metrics.subscribe_time.last),
     ),
-    (
-        DeviceClass.SIGNAL_STRENGTH,
-        Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    ): SensorEntityDescription(
-        key=f"{DeviceClass.SIGNAL_STRENGTH}_{Units.SIGNAL_STRENGTH_DECIBELS_MILLIWATT}",
-        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
-        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    IGrillDiagnosticEntityDescription(
+        key="notification_latency",
+        name="Notification latency",
+        native_unit_of_measurement=TIME_MILLISECONDS,
         state_class=SensorStateClass.MEASUREMENT,
-        entity_registry_enabled_default=False,
+        value_fn=lambda igrill: _milliseconds(
+            igrill.metrics.notification_latency.mean
+        ),
     ),
-    (DeviceClass.GAS, Units.PERCENTAGE): SensorEntityDescription(
-        key=f"{DeviceClass.GAS}_{Units.PERCENTAGE}",
-        device_class=DeviceClass.GAS,
-        native_unit_of_measurement=PERCENTAGE,
+    IGrillDiagnosticEntityDescription(
+        key="dispatch_lag",
+        name="Dispatch lag",
+        native_unit_of_measurement=TIME_MILLISECONDS,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda igrill: _milliseconds(igrill.metrics.dispatch_lag.mean),
     ),
-    (None, Units.PERCENTAGE): SensorEntityDescription(
-        key=str(Units.PERCENTAGE),
-        device_class=None,
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
+    IGrillDiagnosticEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda igrill: igrill.metrics.counters["reconnects"],
     ),
-}
-
-
-def sensor_device_info_to_hass(
-    sensor_device_info: SensorDeviceInfo,
-) -> DeviceInfo:
-    """Convert a sensor device info to a sensor device info."""
-    hass_device_info = DeviceInfo({})
-    if sensor_device_info.name is not None:
-        hass_device_info[ATTR_NAME] = sensor_device_info.name
-    if sensor_device_info.manufacturer is not None:
-        hass_device_info[ATTR_MANUFACTURER] = sensor_device_info.manufacturer
-    if sensor_device_info.model is not None:
-        hass_device_info[ATTR_MODEL] = sensor_device_info.model
-    if sensor_device_info.sw_version is not None:
-        hass_device_info[ATTR_SW_VERSION] = sensor_device_info.sw_version
-    if sensor_device_info.sw_version is not None:
-        hass_device_info[ATTR_HW_VERSION] = sensor_device_info.hw_version
-    return hass_device_info
-
-
-def device_key_to_bluetooth_entity_key(
-    device_key: DeviceKey,
-) -> PassiveBluetoothEntityKey:
-    """Convert a device key to an entity key."""
-    return PassiveBluetoothEntityKey(device_key.key, device_key.device_id)
-
-
-def sensor_update_to_bluetooth_data_update(
-    sensor_update: SensorUpdate,
-) -> PassiveBluetoothDataUpdate:
-    """Convert a sensor update to a bluetooth data update."""
-    return PassiveBluetoothDataUpdate(
-        devices={
-            device_id: sensor_device_info_to_hass(device_info)
-            for device_id, device_info in sensor_update.devices.items()
-        },
-        entity_descriptions={
-            device_key_to_bluetooth_entity_key(device_key): SENSOR_DESCRIPTIONS[
-                (description.device_class, description.native_unit_of_measurement)
-            ]
-            for device_key, description in sensor_update.entity_descriptions.items()
-            if description.native_unit_of_measurement
-        },
-        entity_data={
-            device_key_to_bluetooth_entity_key(device_key): sensor_values.native_value
-            for device_key, sensor_values in sensor_update.entity_values.items()
-        },
-        entity_names={
-            device_key_to_bluetooth_entity_key(device_key): sensor_values.name
-            for device_key, sensor_values in sensor_update.entity_values.items()
-        },
-    )
+    IGrillDiagnosticEntityDescription(
+        key="suppressed_updates",
+        name="Suppressed updates",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda igrill: igrill.throttle.suppressed,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -144,76 +101,88 @@ async def async_setup_entry(
 ) -> None:
     """Set up IGrill Sensors."""
     igrill: IDevicePeripheral = hass.data[DOMAIN][entry.entry_id]
-    created: set[PassiveBluetoothEntityKey] = set()
+    catalog: EntityCatalog = hass.data[DOMAIN][DATA_CATALOGS][entry.entry_id]
+    device_info = catalog.device_info
+    created = set(catalog.sensors)
 
     @callback
-    def _async_add_or_update_entities(
+    def _async_add_new_entities(
         sensor_data: SensorUpdate,
     ) -> None:
-        """Listen for new entities."""
+        """Add entities for values the catalog did not expect, e.g. ambient temperature."""
         if sensor_data is None:
             return
-        data = sensor_update_to_bluetooth_data_update(sensor_data)
-        entities: list[PassiveBluetoothProcessorEntity] = []
-        for entity_key, description in data.entity_descriptions.items():
-            if entity_key not in created:
-                entities.append(
-                    IGrillSensorEntity(entity_key, description, igrill, sensor_data)
-                )
-                created.add(entity_key)
+        entities: list[IGrillSensorEntity] = []
+        for device_key, description in sensor_data.entity_descriptions.items():
+            if device_key.key in created:
+                continue
+            created.add(device_key.key)
+            if catalog_entry := catalog.add_sensor(device_key.key, description):
+                entities.append(IGrillSensorEntity(catalog_entry, igrill, device_info))
         if entities:
             async_add_entities(entities)
 
-    entry.async_on_unload(igrill.async_add_listener(_async_add_or_update_entities))
+    entry.async_on_unload(igrill.async_add_listener(_async_add_new_entities))
+    # Everything known up front is added in one batch, before the first connection
+    async_add_entities(
+        [
+            *(
+                IGrillSensorEntity(catalog_entry, igrill, device_info)
+                for catalog_entry in catalog.sensors.values()
+            ),
+            *(
+                IGrillPredictionSensorEntity(catalog_entry, igrill, device_info)
+                for catalog_entry in catalog.predictions
+            ),
+            *(
+                IGrillDiagnosticSensorEntity(description, igrill, catalog)
+                for description in DIAGNOSTIC_DESCRIPTIONS
+            ),
+        ]
+    )
+
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_PROBE_TARGET,
+        {vol.Required(ATTR_TARGET_TEMPERATURE): vol.Coerce(float)},
+        "async_set_probe_target",
+    )
 
 
 class IGrillSensorEntity(
-    SensorEntity,
+    RestoreSensor,
 ):
+    """
+    Representation of a iGrill sensor.
+    Until the device reports a value, the last one from before the restart is shown,
+    marked stale, so dashboards aren't empty while the grill is being connected to.
+    """
+
     _attr_has_entity_name = True
     _attr_should_poll = False
-    """Representation of a iGrill sensor."""
 
     def __init__(
         self,
-        entity_key: PassiveBluetoothEntityKey,
-        description: EntityDescription,
+        catalog_entry: CatalogEntry,
         data: IDevicePeripheral,
-        entity_data: PassiveBluetoothDataUpdate,
+        device_info: DeviceInfo,
     ) -> None:
-        self.entity_key = entity_key
-        self.entity_description = description
+        self.entity_key = catalog_entry.entity_key
+        self.entity_description = catalog_entry.description
         self.data = data
+        self._attr_name = catalog_entry.name
+        self._attr_unique_id = catalog_entry.unique_id
+        self._attr_device_info = device_info
+        self.val = None
+        self.last_seen = None
 
-        passive_update = sensor_update_to_bluetooth_data_update(entity_data)
-        device_id = entity_key.device_id
-        address = data.address
-        devices = passive_update.devices
-        key = entity_key.key
-        if device_id in devices:
-            base_device_info = devices[device_id]
-        else:
-            base_device_info = DeviceInfo({})
-        if device_id:
-            self._attr_device_info = base_device_info | DeviceInfo(
-                {ATTR_IDENTIFIERS: {(DOMAIN, f"{address}-{device_id}")}}
-            )
-            self._attr_unique_id = f"{address}-{key}-{device_id}"
-        else:
-            self._attr_device_info = base_device_info | DeviceInfo(
-                {ATTR_IDENTIFIERS: {(DOMAIN, address)}}
-            )
-            self._attr_unique_id = f"{address}-{key}"
-        if ATTR_NAME not in self._attr_device_info:
-            self._attr_device_info[ATTR_NAME] = data.bt_name
-        self._attr_name = passive_update.entity_names.get(entity_key)
-        self.val = passive_update.entity_data[self.entity_key]
-
-    def update(self, update: SensorUpdate):
-        passive_update = sensor_update_to_bluetooth_data_update(update)
-        if self.entity_key in passive_update.entity_data:
-            self.val = passive_update.entity_data[self.entity_key]
-            self.schedule_update_ha_state()
+    @callback
+    def update(self, value):
+        # Availability refreshes push None for values not received since the restart
+        if value is not None or self.last_seen is None:
+            self.val = value
+            self.last_seen = None
+        self.async_write_ha_state()
 
     @property
     def native_value(self):
@@ -221,11 +190,67 @@ class IGrillSensorEntity(
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
+        self.val = self.data.get_data(self.entity_key)
+        if self.val is None:
+            last_sensor_data = await self.async_get_last_sensor_data()
+            last_state = await self.async_get_last_state()
+            if (
+                last_sensor_data
+                and last_state
+                and last_sensor_data.native_value is not None
+            ):
+                self.val = last_sensor_data.native_value
+                self.last_seen = last_state.last_updated
         self.async_on_remove(
-            self.data.async_add_listener(lambda data: self.update(data))
+            self.data.async_add_entity_listener(self.entity_key, self.update)
         )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self.last_seen is None:
+            return None
+        return {"stale": True, "last_seen": self.last_seen.isoformat()}
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        return self.data.client and self.data.client.is_connected
+        return self.last_seen is not None or self.data.available
+
+    async def async_set_probe_target(self, target_temperature: float) -> None:
+        """Set the probe's target, used for its threshold alarm and ETA."""
+        if self.entity_key.key not in self.data.predictors:
+            raise HomeAssistantError(f"{self.entity_id} is not a probe")
+        await self.data.async_set_probe_threshold(
+            self.entity_key.key, target_temperature
+        )
+
+
+class IGrillPredictionSensorEntity(IGrillSensorEntity):
+    """The predicted ETA or heating rate of a probe."""
+
+    async def async_set_probe_target(self, target_temperature: float) -> None:
+        raise HomeAssistantError(f"{self.entity_id} is not a probe")
+
+
+class IGrillDiagnosticSensorEntity(SensorEntity):
+    """A disabled by default sensor exposing the device's instrumentation."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    entity_description: IGrillDiagnosticEntityDescription
+
+    def __init__(
+        self,
+        description: IGrillDiagnosticEntityDescription,
+        data: IDevicePeripheral,
+        catalog: EntityCatalog,
+    ) -> None:
+        self.entity_description = description
+        self.data = data
+        self._attr_unique_id = catalog.unique_id(description.key)
+        self._attr_device_info = catalog.device_info
+
+    @property
+    def native_value(self) -> StateType:
+        return self.entity_description.value_fn(self.data)
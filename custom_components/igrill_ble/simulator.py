@@ -0,0 +1,294 @@
+"""
+Simulated iGrill GATT server and a BleakClient stand-in that talks to it, so the
+integration can be exercised and replayed without a physical grill.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import struct
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from bleak.exc import BleakError
+
+from .igrill import UUIDS, IDevicePeripheral
+
+
+class SimulatedCharacteristic(NamedTuple):
+    uuid: str
+    handle: int
+
+
+class SimulatedServices:
+    """The subset of BleakGATTServiceCollection used by the integration."""
+
+    def __init__(self, characteristics: dict[str, SimulatedCharacteristic]):
+        self._characteristics = characteristics
+        self._by_handle = {char.handle: char for char in characteristics.values()}
+
+    def get_characteristic(self, specifier) -> SimulatedCharacteristic | None:
+        if isinstance(specifier, int):
+            return self._by_handle.get(specifier)
+        return self._characteristics.get(str(specifier).lower())
+
+
+class SessionRecord(NamedTuple):
+    """One recorded notification: seconds since the start of the cook, uuid and raw payload."""
+
+    time: float
+    uuid: str
+    payload: bytes
+
+
+def temperature_payload(temp: float | None) -> bytes:
+    """Encode a probe temperature, None meaning an unplugged probe."""
+    return struct.pack("<H", 63536 if temp is None else int(round(temp)))
+
+
+def load_session(path: str | os.PathLike) -> list[SessionRecord]:
+    """
+    Load a recorded cook, stored as JSON lines of
+    {"time": <seconds>, "uuid": <characteristic>, "payload": <hex>}.
+    """
+    records = []
+    with open(path, encoding="utf-8") as session:
+        for line in session:
+            if line.strip():
+                record = json.loads(line)
+                records.append(
+                    SessionRecord(
+                        float(record["time"]),
+                        record["uuid"].lower(),
+                        bytes.fromhex(record["payload"]),
+                    )
+                )
+    return records
+
+
+class SimulatedIGrill:
+    """
+    A grill's GATT table and behaviour: the challenge/response handshake, optional
+    per-operation latency and random link drops, and notification streams.
+    """
+
+    def __init__(
+        self,
+        address: str = "70:91:8F:00:00:01",
+        name: str = "iGrill_v2",
+        num_probes: int = 4,
+        has_ambient_temp: bool = False,
+        has_battery: bool = True,
+        has_heating_element: bool = False,
+        has_propane: bool = False,
+        has_led_knob_light: bool = False,
+        firmware: str = "1.0.0",
+        latency: float = 0.0,
+        drop_rate: float = 0.0,
+        resume_sessions: bool = True,
+    ):
+        self.address = address
+        self.name = name
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.resume_sessions = resume_sessions
+        self.connect_failures = 0
+        self.bonded = False
+        self.authenticated = False
+        self.client: FakeBleakClient | None = None
+        self.values: dict[str, bytes] = {
+            UUIDS.FIRMWARE_VERSION.lower(): firmware.encode("utf-8") + b"\x00",
+            UUIDS.APP_CHALLENGE.lower(): bytes(16),
+            UUIDS.DEVICE_CHALLENGE.lower(): bytes(16),
+            UUIDS.DEVICE_RESPONSE.lower(): bytes(16),
+        }
+        for probe_num in range(1, num_probes + 1):
+            self.values[
+                getattr(UUIDS, f"PROBE{probe_num}_TEMPERATURE").lower()
+            ] = temperature_payload(None)
+            self.values[
+                getattr(UUIDS, f"PROBE{probe_num}_THRESHOLD").lower()
+            ] = bytes(2)
+        if has_ambient_temp:
+            self.values[UUIDS.AMBIENT_TEMPERATURE.lower()] = temperature_payload(None)
+        if has_battery:
+            self.values[UUIDS.BATTERY_LEVEL.lower()] = bytes([100])
+        if has_heating_element:
+            self.values[UUIDS.HEATING_ELEMENTS.lower()] = b"0 0 0 0"
+        if has_propane:
+            self.values[UUIDS.PROPANE_LEVEL.lower()] = bytes([4])
+        if has_led_knob_light:
+            self.values[UUIDS.LED_KNOB_TOGGLE.lower()] = bytes([0])
+        self.characteristics = {
+            uuid: SimulatedCharacteristic(uuid, handle)
+            for handle, uuid in enumerate(self.values, start=0x10)
+        }
+        self._expected_response: bytes | None = None
+
+    @classmethod
+    def for_peripheral(cls, peripheral: IDevicePeripheral, **kwargs) -> SimulatedIGrill:
+        """Build a simulator exposing the characteristics of a device type."""
+        kwargs.setdefault("name", peripheral.name)
+        return cls(
+            num_probes=peripheral.num_probes,
+            has_battery=peripheral.has_battery,
+            has_heating_element=peripheral.has_heating_element,
+            has_propane=peripheral.has_propane,
+            has_led_knob_light=peripheral.has_led_knob_light,
+            **kwargs,
+        )
+
+    @property
+    def client_class(self) -> type[FakeBleakClient]:
+        """A client class bound to this grill, for IDevicePeripheral.client_class."""
+        return type("FakeBleakClient", (FakeBleakClient,), {"simulator": self})
+
+    def resolve(self, specifier) -> str:
+        if isinstance(specifier, int):
+            for uuid, char in self.characteristics.items():
+                if char.handle == specifier:
+                    return uuid
+        elif str(specifier).lower() in self.characteristics:
+            return str(specifier).lower()
+        raise BleakError(f"Characteristic {specifier} was not found!")
+
+    def set_value(self, uuid: str, payload: bytes) -> None:
+        """Change a characteristic, notifying the connected client if it subscribed."""
+        uuid = uuid.lower()
+        self.values[uuid] = payload
+        if self.client:
+            self.client.notify(uuid, payload)
+
+    def set_temperature(self, probe: int | str, temp: float | None) -> None:
+        """Set a probe (by number) or "ambient" temperature."""
+        if probe == "ambient":
+            self.set_value(UUIDS.AMBIENT_TEMPERATURE, temperature_payload(temp))
+        else:
+            self.set_value(
+                getattr(UUIDS, f"PROBE{probe}_TEMPERATURE"), temperature_payload(temp)
+            )
+
+    async def async_replay(
+        self, records: Iterable[SessionRecord], speed: float = 1.0
+    ) -> None:
+        """Play back a recorded cook, speed > 1 compressing time."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for record in records:
+            delay = start + record.time / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.set_value(record.uuid, record.payload)
+
+    def handle_write(self, uuid: str, data: bytes) -> None:
+        if uuid == UUIDS.APP_CHALLENGE.lower():
+            # The real device encrypts the challenge, any opaque token will do here
+            self._expected_response = bytes(random.getrandbits(8) for _ in range(16))
+            self.values[UUIDS.DEVICE_CHALLENGE.lower()] = self._expected_response
+        elif uuid == UUIDS.DEVICE_RESPONSE.lower():
+            if not self.bonded or data != self._expected_response:
+                raise BleakError("Authentication failed")
+            self.authenticated = True
+        else:
+            self.check_authenticated()
+        self.values[uuid] = data
+
+    def check_authenticated(self) -> None:
+        if not self.authenticated:
+            raise BleakError("[org.bluez.Error.NotAuthorized] Operation Not Authorized")
+
+    def disconnected(self) -> None:
+        self.client = None
+        if not self.resume_sessions:
+            self.authenticated = False
+            self.bonded = False
+
+
+class FakeBleakClient:
+    """Implements the BleakClient calls the integration makes against a SimulatedIGrill."""
+
+    simulator: SimulatedIGrill
+
+    def __init__(
+        self,
+        address_or_ble_device,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        **kwargs,
+    ):
+        self._disconnected_callback = disconnected_callback
+        self._notify_callbacks: dict[str, Callable[[Any, bytearray], None]] = {}
+        self.is_connected = False
+
+    async def _async_operation(self) -> None:
+        simulator = self.simulator
+        if not self.is_connected:
+            raise BleakError("Not connected")
+        if simulator.latency:
+            await asyncio.sleep(simulator.latency)
+        if simulator.drop_rate and random.random() < simulator.drop_rate:
+            self._drop()
+            raise BleakError("Disconnected during operation")
+
+    def _drop(self) -> None:
+        if self.is_connected:
+            self.is_connected = False
+            self.simulator.disconnected()
+            if self._disconnected_callback:
+                self._disconnected_callback(self)
+
+    async def connect(self, **kwargs) -> bool:
+        simulator = self.simulator
+        if simulator.latency:
+            await asyncio.sleep(simulator.latency)
+        if simulator.connect_failures:
+            simulator.connect_failures -= 1
+            raise BleakError("Simulated connection failure")
+        if simulator.client:
+            raise BleakError("Device is already connected")
+        simulator.client = self
+        self.is_connected = True
+        return True
+
+    async def disconnect(self) -> bool:
+        self._drop()
+        return True
+
+    async def pair(self, *args, **kwargs) -> bool:
+        await self._async_operation()
+        self.simulator.bonded = True
+        return True
+
+    async def get_services(self) -> SimulatedServices:
+        await self._async_operation()
+        return self.services
+
+    @property
+    def services(self) -> SimulatedServices:
+        return SimulatedServices(self.simulator.characteristics)
+
+    async def read_gatt_char(self, specifier, **kwargs) -> bytearray:
+        await self._async_operation()
+        uuid = self.simulator.resolve(specifier)
+        if uuid != UUIDS.DEVICE_CHALLENGE.lower():
+            self.simulator.check_authenticated()
+        return bytearray(self.simulator.values[uuid])
+
+    async def write_gatt_char(self, specifier, data, response: bool = False) -> None:
+        await self._async_operation()
+        self.simulator.handle_write(self.simulator.resolve(specifier), bytes(data))
+
+    async def start_notify(self, specifier, callback, **kwargs) -> None:
+        await self._async_operation()
+        uuid = self.simulator.resolve(specifier)
+        self.simulator.check_authenticated()
+        self._notify_callbacks[uuid] = callback
+
+    async def stop_notify(self, specifier) -> None:
+        await self._async_operation()
+        self._notify_callbacks.pop(self.simulator.resolve(specifier), None)
+
+    def notify(self, uuid: str, payload: bytes) -> None:
+        if self.is_connected and (callback := self._notify_callbacks.get(uuid)):
+            callback(self.simulator.characteristics[uuid], bytearray(payload))
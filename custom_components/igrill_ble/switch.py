@@ -0,0 +1,66 @@
+"""Knob light switch for iGrill devices."""
+from __future__ import annotations
+
+from typing import Any
+
+from bleak.exc import BleakError
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .catalog import EntityCatalog
+from .const import DATA_CATALOGS, DOMAIN
+from .igrill import IDevicePeripheral
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the IGrill knob light."""
+    igrill: IDevicePeripheral = hass.data[DOMAIN][entry.entry_id]
+    catalog: EntityCatalog = hass.data[DOMAIN][DATA_CATALOGS][entry.entry_id]
+    if catalog.led_knob:
+        async_add_entities([IGrillLedKnobEntity(igrill, catalog)])
+
+
+class IGrillLedKnobEntity(SwitchEntity):
+    """
+    The knob light. The device doesn't report its state, so the last one written
+    is assumed.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_assumed_state = True
+    _attr_name = "Knob light"
+    _attr_icon = "mdi:knob"
+
+    def __init__(self, data: IDevicePeripheral, catalog: EntityCatalog) -> None:
+        self.data = data
+        self._attr_unique_id = catalog.unique_id("led_knob")
+        self._attr_device_info = catalog.device_info
+
+    @property
+    def is_on(self) -> bool | None:
+        return self.data.led_on
+
+    @property
+    def available(self) -> bool:
+        return self.data.available
+
+    async def _async_set(self, on: bool) -> None:
+        try:
+            await self.data.set_led_state(on)
+        except (BleakError, ConnectionError) as err:
+            raise HomeAssistantError(str(err)) from err
+        self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_set(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_set(False)
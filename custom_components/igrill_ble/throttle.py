@@ -0,0 +1,99 @@
+"""Rate limiting of the values published to entities."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from .core import EntityKey
+
+_MISSING = object()
+
+
+class PublishPolicy(NamedTuple):
+    """
+    Unchanged values are never published. Numeric values within deadband of the
+    last published one are dropped, and a key is published at most once per
+    min_interval seconds, with the latest value flushed once the interval ends.
+    """
+
+    deadband: float = 0.0
+    min_interval: float = 0.0
+
+
+DEFAULT_POLICY = PublishPolicy()
+
+
+class PublishThrottle:
+    """Decides which value changes reach the entities, counting the ones that don't."""
+
+    def __init__(
+        self, publish: Callable[[EntityKey, Any], None]
+    ) -> None:
+        self.published = 0
+        self.suppressed = 0
+        self._publish = publish
+        self._policies: dict[str, PublishPolicy] = {}
+        self._last_value: dict[EntityKey, Any] = {}
+        self._last_time: dict[EntityKey, float] = {}
+        self._pending: dict[EntityKey, Any] = {}
+        self._flush_handles: dict[EntityKey, asyncio.TimerHandle] = {}
+
+    def set_policy(self, key: str, policy: PublishPolicy) -> None:
+        self._policies[key] = policy
+
+    def should_publish(self, entity_key: EntityKey, value) -> bool:
+        """Return whether value should be published now, scheduling a flush if deferred."""
+        policy = self._policies.get(entity_key.key, DEFAULT_POLICY)
+        last = self._last_value.get(entity_key, _MISSING)
+        if last is not _MISSING and (
+            value == last
+            or (
+                policy.deadband
+                and isinstance(value, (int, float))
+                and isinstance(last, (int, float))
+                and abs(value - last) < policy.deadband
+            )
+        ):
+            self._pending.pop(entity_key, None)
+            self.suppressed += 1
+            return False
+        now = time.monotonic()
+        if policy.min_interval:
+            next_time = self._last_time.get(entity_key, 0) + policy.min_interval
+            if now < next_time:
+                self._pending[entity_key] = value
+                if entity_key not in self._flush_handles:
+                    self._flush_handles[entity_key] = asyncio.get_running_loop().call_later(
+                        next_time - now, self._flush, entity_key
+                    )
+                self.suppressed += 1
+                return False
+        self._pending.pop(entity_key, None)
+        self._record(entity_key, value, now)
+        return True
+
+    def record_published(self, entity_key: EntityKey, value) -> None:
+        """Note a value written to its entities outside of the throttle, e.g. in full."""
+        self._pending.pop(entity_key, None)
+        self._record(entity_key, value, time.monotonic())
+
+    def _record(self, entity_key, value, now) -> None:
+        self._last_value[entity_key] = value
+        self._last_time[entity_key] = now
+        self.published += 1
+
+    def _flush(self, entity_key: EntityKey) -> None:
+        del self._flush_handles[entity_key]
+        value = self._pending.pop(entity_key, _MISSING)
+        if value is not _MISSING:
+            self._record(entity_key, value, time.monotonic())
+            self._publish(entity_key, value)
+
+    def cancel(self) -> None:
+        """Drop any trailing flushes that are still scheduled."""
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+        self._pending.clear()
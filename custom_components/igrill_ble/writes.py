@@ -0,0 +1,82 @@
+"""Serialized, coalescing writes to a device's characteristics."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from .metrics import DeviceMetrics
+
+
+class WriteQueue:
+    """
+    Runs one write at a time, in the order characteristics were first queued.
+    A write queued while an earlier one to the same characteristic is still waiting
+    replaces its data, so rapid changes, e.g. dragging a probe target, only send the
+    latest value. Every caller waits for the write that carried its data, or the
+    one that replaced it.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, bytes], Awaitable[None]],
+        metrics: DeviceMetrics,
+    ) -> None:
+        self._write = write
+        self._metrics = metrics
+        self._pending: dict[str, tuple[bytes, list[asyncio.Future]]] = {}
+        # Callers of the write being sent
+        self._inflight: list[asyncio.Future] = []
+        self._task: asyncio.Task | None = None
+
+    async def async_write(self, char: str, data: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if char in self._pending:
+            self._metrics.counters["coalesced_writes"] += 1
+            _, futures = self._pending.pop(char)
+            futures.append(future)
+        else:
+            futures = [future]
+        self._pending[char] = (data, futures)
+        if self._task is None:
+            self._task = loop.create_task(self._async_run())
+        await future
+
+    async def _async_run(self) -> None:
+        pending, metrics = self._pending, self._metrics
+        try:
+            while pending:
+                char = next(iter(pending))
+                data, futures = pending.pop(char)
+                self._inflight = futures
+                start = time.perf_counter()
+                try:
+                    await self._write(char, data)
+                except Exception as err:  # pylint: disable=broad-except
+                    metrics.counters["write_failures"] += 1
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    metrics.write_time.record(time.perf_counter() - start)
+                    metrics.counters["writes"] += 1
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(None)
+                self._inflight = []
+        finally:
+            self._task = None
+
+    def cancel(self) -> None:
+        """Abandon the write being sent and those waiting, cancelling their callers."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for future in self._inflight:
+            future.cancel()
+        self._inflight = []
+        for _, futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending.clear()
@@ -0,0 +1,47 @@
+"""
+The tests exercise the protocol modules against the simulator, without Home
+Assistant. They are loaded as the igrill_ble package without its __init__, which
+sets up the integration and needs Home Assistant, as cli.py does.
+"""
+import asyncio
+import os
+import sys
+import types
+
+import pytest
+from bleak.backends.device import BLEDevice
+
+PACKAGE_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    os.pardir,
+    "custom_components",
+    "igrill_ble",
+)
+
+if "igrill_ble" not in sys.modules:
+    package = types.ModuleType("igrill_ble")
+    package.__path__ = [os.path.normpath(PACKAGE_DIRECTORY)]
+    sys.modules["igrill_ble"] = package
+
+from igrill_ble.simulator import SimulatedIGrill  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    """An event loop for driving the peripherals from synchronous benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture
+def simulate():
+    """Bind a peripheral to a simulator of its model, returning the simulator and its device."""
+
+    def simulate(peripheral, **kwargs) -> tuple[SimulatedIGrill, BLEDevice]:
+        simulator = SimulatedIGrill.for_peripheral(peripheral, **kwargs)
+        peripheral.client_class = simulator.client_class
+        return simulator, BLEDevice(simulator.address, simulator.name, None)
+
+    return simulate
@@ -0,0 +1,227 @@
+"""
+Benchmarks of the protocol modules against the simulated grill, run with
+
+    pytest tests --benchmark-only
+"""
+import asyncio
+import gc
+import math
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import pytest
+
+from igrill_ble import igrill
+from igrill_ble.const import SUBSCRIBE_CONCURRENCY
+from igrill_ble.core import EntityKey
+from igrill_ble.igrill import DEVICE_TYPES
+from igrill_ble.prediction import ProbePredictor
+
+# Notifications sent per round of the dispatch benchmark
+NOTIFICATIONS = 1000
+# Devices connected per model by the memory benchmark
+DEVICES = 100
+# Seconds each simulated GATT operation takes in the latency benchmarks
+LATENCY = 0.01
+# Hours of the cook replayed into the predictor, at the probes' 1Hz rate
+COOK_HOURS = 16
+
+
+# Imports igrill.py in a fresh interpreter, printing the seconds taken and whether
+# the BLE stack was loaded with it
+IMPORT_IGRILL = f"""
+import sys, time, types
+package = types.ModuleType("igrill_ble")
+package.__path__ = [{os.path.dirname(igrill.__file__)!r}]
+sys.modules["igrill_ble"] = package
+start = time.perf_counter()
+import igrill_ble.igrill
+print(time.perf_counter() - start, "bleak" in sys.modules)
+"""
+
+
+def test_import(benchmark):
+    """Startup cost of the protocol module, which leaves the BLE stack to the first connect."""
+
+    def import_igrill():
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_IGRILL],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        return float(output[0]), output[1] == "True"
+
+    seconds, bleak_loaded = benchmark.pedantic(import_igrill, rounds=5)
+    benchmark.extra_info["import_seconds"] = seconds
+    assert not bleak_loaded
+
+
+def test_connect_to_first_reading(benchmark, loop, simulate):
+    """async_init of a V3, from connecting until its first readings are published."""
+    peripherals = []
+
+    def setup():
+        peripheral = DEVICE_TYPES["igrill_v3"]()
+        _, device = simulate(peripheral)
+        peripherals.append(peripheral)
+        return (peripheral, device), {}
+
+    def connect(peripheral, device):
+        loop.run_until_complete(peripheral.async_init(device))
+
+    benchmark.pedantic(connect, setup=setup, rounds=50)
+    assert all(
+        peripheral.get_data(EntityKey("probe_1", None)) is not None
+        for peripheral in peripherals
+    )
+    for peripheral in peripherals:
+        loop.run_until_complete(peripheral.close())
+
+
+def _first_reading_time(loop, simulate) -> float:
+    """Seconds from connecting to a V3 over a slow link until its first readings."""
+    peripheral = DEVICE_TYPES["igrill_v3"]()
+    _, device = simulate(peripheral, latency=LATENCY)
+    start = loop.time()
+    loop.run_until_complete(peripheral.async_init(device))
+    elapsed = loop.time() - start
+    loop.run_until_complete(peripheral.close())
+    return elapsed
+
+
+@pytest.mark.parametrize(
+    "concurrency", [1, SUBSCRIBE_CONCURRENCY], ids=["serial", "pipelined"]
+)
+def test_first_reading_with_latency(
+    benchmark, loop, simulate, monkeypatch, concurrency
+):
+    """
+    Time to first reading over a link with LATENCY per operation, subscribing one
+    characteristic at a time as before the setup stage was batched, or pipelined.
+    """
+    monkeypatch.setattr(igrill, "SUBSCRIBE_CONCURRENCY", concurrency)
+    benchmark.pedantic(_first_reading_time, args=(loop, simulate), rounds=5)
+
+
+def test_pipelined_subscription_is_faster(loop, simulate, monkeypatch):
+    pipelined = _first_reading_time(loop, simulate)
+    monkeypatch.setattr(igrill, "SUBSCRIBE_CONCURRENCY", 1)
+    serial = _first_reading_time(loop, simulate)
+    # The handshake and discovery stay serial, subscribing takes two round trips per
+    # SUBSCRIBE_CONCURRENCY characteristics instead of two per characteristic
+    assert pipelined < 0.7 * serial
+
+
+def test_notification_dispatch(benchmark, loop, simulate):
+    """
+    Probe notifications from the simulated link to the entity listener a sensor
+    subscribes with, each dispatched on its own before the next is sent.
+    """
+    peripheral = DEVICE_TYPES["igrill_v2"]()
+    simulator, device = simulate(peripheral)
+    loop.run_until_complete(peripheral.async_init(device))
+    received = []
+    peripheral.async_add_entity_listener(EntityKey("probe_1", None), received.append)
+
+    async def notify():
+        for sample in range(NOTIFICATIONS):
+            simulator.set_temperature(1, 20 + sample % 200)
+            await asyncio.sleep(0)
+
+    benchmark(lambda: loop.run_until_complete(notify()))
+    benchmark.extra_info["seconds_per_notification"] = (
+        benchmark.stats.stats.mean / NOTIFICATIONS
+    )
+    # Every notification changes the reading, so each one reaches the listener
+    assert len(received) >= NOTIFICATIONS
+    loop.run_until_complete(peripheral.close())
+
+
+@pytest.mark.parametrize("sensor_type", sorted(DEVICE_TYPES))
+def test_memory_per_device(benchmark, loop, simulate, sensor_type):
+    """Bytes allocated per connected, authenticated and subscribed device of every model."""
+    peripheral_class = DEVICE_TYPES[sensor_type]
+    # The simulators and their client classes are set up outside of the measurement
+    simulators = [simulate(peripheral_class()) for _ in range(DEVICES)]
+    client_classes = [simulator.client_class for simulator, _ in simulators]
+    peripherals = []
+
+    def connect_all():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for client_class, (_, device) in zip(client_classes, simulators):
+                peripheral = peripheral_class()
+                peripheral.client_class = client_class
+                loop.run_until_complete(peripheral.async_init(device))
+                peripherals.append(peripheral)
+            gc.collect()
+            return (tracemalloc.get_traced_memory()[0] - before) / DEVICES
+        finally:
+            tracemalloc.stop()
+
+    per_device = benchmark.pedantic(connect_all, rounds=1, iterations=1)
+    benchmark.extra_info["bytes_per_device"] = round(per_device)
+    for peripheral in peripherals:
+        loop.run_until_complete(peripheral.close())
+    # Regressions like preallocating every sensor's full history show up as megabytes
+    assert per_device < 64 * 1024
+
+
+def _brisket(hours: int = COOK_HOURS) -> list[tuple[float, float]]:
+    """
+    A 1Hz probe trace of a long cook: heating towards the pit temperature, a stall
+    at 68-70°C from the fourth hour to the tenth, then finishing towards 95°C.
+    """
+    samples = []
+    for second in range(hours * 3600):
+        hour = second / 3600
+        if hour < 4:
+            temperature = 110 - 105 * math.exp(-hour / 1.6)
+        elif hour < 10:
+            temperature = 68.1 + (hour - 4) / 3
+        else:
+            temperature = 70.1 + 25 * (1 - math.exp(-(hour - 10) / 2))
+        samples.append((float(second), temperature))
+    return samples
+
+
+def test_prediction_replay(benchmark):
+    """A whole cook through a ProbePredictor, its state staying a fixed size."""
+    samples = _brisket()
+    hour = 3600
+
+    def replay():
+        predictor = ProbePredictor()
+        predictor.set_target(93)
+        # The cost of each hour of samples
+        hourly = []
+        for start in range(0, len(samples), hour):
+            begin = time.perf_counter()
+            for timestamp, temperature in samples[start : start + hour]:
+                predictor.add(timestamp, temperature)
+            hourly.append(time.perf_counter() - begin)
+        return predictor, hourly
+
+    predictor, hourly = benchmark.pedantic(replay, rounds=3)
+    benchmark.extra_info["seconds_per_sample"] = (
+        benchmark.stats.stats.mean / len(samples)
+    )
+    # Reported rather than asserted, timings of a single hour are too noisy
+    benchmark.extra_info["first_hour_seconds"] = hourly[0]
+    benchmark.extra_info["last_hour_seconds"] = hourly[-1]
+    assert predictor.samples == len(samples)
+    # Nothing is kept per sample: the state is a fixed set of scalars, with no
+    # instance dict or container to grow over the cook
+    for state in (predictor, predictor._linear, predictor._heating):
+        assert not hasattr(state, "__dict__")
+        for name in type(state).__slots__:
+            value = getattr(state, name)
+            assert value is None or isinstance(
+                value, (bool, int, float, type(predictor._linear))
+            ), name
@@ -0,0 +1,108 @@
+"""The standalone daemon, end to end against simulated grills."""
+import argparse
+import asyncio
+import json
+import socket
+
+import pytest
+
+from igrill_ble.cli import async_main
+from igrill_ble.igrill import UUIDS
+
+ADDRESSES = {"70:91:8F:00:00:01": "igrill_v2", "70:91:8F:00:00:02": "pulse_2000"}
+
+
+@pytest.fixture
+def session(tmp_path) -> str:
+    """A recorded cook warming probe 1 a degree every 50ms, for the simulated grills to play."""
+    path = tmp_path / "session.jsonl"
+    path.write_text(
+        "".join(
+            json.dumps(
+                {
+                    "time": step * 0.05,
+                    "uuid": UUIDS.PROBE1_TEMPERATURE,
+                    "payload": (20 + step).to_bytes(2, "little").hex(),
+                }
+            )
+            + "\n"
+            for step in range(1, 40)
+        )
+    )
+    return str(path)
+
+
+def _args(**kwargs) -> argparse.Namespace:
+    args = argparse.Namespace(
+        address=None,
+        listen=None,
+        low_duty=None,
+        simulate=list(ADDRESSES.values()),
+        replay=None,
+        speed=1.0,
+    )
+    vars(args).update(kwargs)
+    return args
+
+
+def _values(records: list[dict]) -> dict[str, dict]:
+    """The latest value of every key, by address."""
+    values = {}
+    for record in records:
+        if record["event"] == "values":
+            values.setdefault(record["address"], {}).update(record["values"])
+    return values
+
+
+def _check_values(records: list[dict]) -> None:
+    values = _values(records)
+    assert set(values) == set(ADDRESSES)
+    # Probe 1 followed the session while it played
+    assert all(grill["probe_1"] > 20 for grill in values.values())
+
+
+def test_stdout(capsysbinary, session):
+    async def run():
+        stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.3, stop.set)
+        await async_main(_args(replay=session), stop)
+
+    asyncio.run(run())
+    records = [json.loads(line) for line in capsysbinary.readouterr().out.splitlines()]
+    added = {
+        record["address"]: record["model"]
+        for record in records
+        if record["event"] == "added"
+    }
+    assert added == ADDRESSES
+    assert "heating_element_left_setpoint" in _values(records)["70:91:8F:00:00:02"]
+    _check_values(records)
+
+
+def test_listen(session):
+    with socket.socket() as free:
+        free.bind(("127.0.0.1", 0))
+        port = free.getsockname()[1]
+
+    async def run():
+        stop = asyncio.Event()
+        args = _args(listen=f"127.0.0.1:{port}", replay=session)
+        daemon = asyncio.create_task(async_main(args, stop))
+        # Until the daemon is listening
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                break
+            except ConnectionRefusedError:
+                await asyncio.sleep(0.01)
+        asyncio.get_running_loop().call_later(0.3, stop.set)
+        lines = []
+        # The stream ends when the daemon closes it on stopping
+        while line := await reader.readline():
+            lines.append(line)
+        writer.close()
+        await daemon
+        return lines
+
+    # Grills are added before a client can connect, it only receives their values
+    _check_values([json.loads(line) for line in asyncio.run(run())])
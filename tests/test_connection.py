@@ -0,0 +1,107 @@
+"""Connection supervision against the simulated grill."""
+import asyncio
+
+import pytest
+
+from igrill_ble.connection import (
+    ConnectionScheduler,
+    ConnectionState,
+    ConnectionSupervisor,
+)
+from igrill_ble.igrill import IGrillV2Peripheral
+
+
+class DroppingPeripheral(IGrillV2Peripheral):
+    """Loses the link right after subscribing, before the supervisor resumes."""
+
+    drop = True
+
+    async def async_subscribe(self, notify=True):
+        await super().async_subscribe(notify)
+        if self.drop:
+            self.client._drop()
+
+
+def test_drop_after_subscribe_reconnects(simulate):
+    async def run():
+        peripheral = DroppingPeripheral()
+        _, device = simulate(peripheral)
+        supervisor = ConnectionSupervisor(peripheral)
+        supervisor.async_advertisement(device)
+        await asyncio.sleep(0.05)
+        assert supervisor.state is ConnectionState.IDLE
+        assert peripheral.client is None
+
+        peripheral.drop = False
+        supervisor.async_advertisement(device)
+        await asyncio.sleep(0.05)
+        assert supervisor.state is ConnectionState.SUBSCRIBED
+        assert peripheral.client.is_connected
+        supervisor.async_stop()
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_scheduler_caps_slots_per_adapter():
+    async def run():
+        scheduler = ConnectionScheduler(slots_per_adapter=2)
+        await scheduler.async_acquire("hci0", 0)
+        await scheduler.async_acquire("hci0", 0)
+        # Other adapters have slots of their own
+        await asyncio.wait_for(scheduler.async_acquire("hci1", 0), 1)
+
+        third = asyncio.create_task(scheduler.async_acquire("hci0", 0))
+        await asyncio.sleep(0.01)
+        assert not third.done()
+        scheduler.release("hci0")
+        await asyncio.wait_for(third, 1)
+
+    asyncio.run(run())
+
+
+def test_scheduler_grants_in_priority_order():
+    async def run():
+        scheduler = ConnectionScheduler(slots_per_adapter=1)
+        await scheduler.async_acquire("hci0", 0)
+        granted = []
+
+        async def acquire(name, priority):
+            await scheduler.async_acquire("hci0", priority)
+            granted.append(name)
+
+        waiters = [
+            asyncio.create_task(acquire(name, priority))
+            for name, priority in [("late", 2), ("first", 1), ("second", 1)]
+        ]
+        await asyncio.sleep(0.01)
+        for _ in waiters:
+            scheduler.release("hci0")
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        # Lower priorities first, then in the order they were queued
+        assert granted == ["first", "second", "late"]
+
+    asyncio.run(run())
+
+
+def test_scheduler_releases_slot_of_cancelled_waiter():
+    async def run():
+        scheduler = ConnectionScheduler(slots_per_adapter=1)
+        await scheduler.async_acquire("hci0", 0)
+        handed = asyncio.create_task(scheduler.async_acquire("hci0", 0))
+        queued = asyncio.create_task(scheduler.async_acquire("hci0", 0))
+        await asyncio.sleep(0.01)
+
+        # Cancelled after the slot was handed over, before it could run
+        scheduler.release("hci0")
+        handed.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handed
+        await asyncio.wait_for(queued, 1)
+
+        # The slot went on to the next waiter rather than leaking
+        scheduler.release("hci0")
+        await asyncio.wait_for(scheduler.async_acquire("hci0", 0), 1)
+
+    asyncio.run(run())
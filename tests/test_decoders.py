@@ -0,0 +1,70 @@
+"""Payload decoders."""
+import pytest
+
+from igrill_ble.decoders import (
+    decode_battery,
+    decode_heating_elements,
+    decode_propane,
+    decode_temperature,
+)
+from igrill_ble.igrill import DECODERS, UUIDS
+
+# Payloads as notified by the grills, by characteristic
+CAPTURED = [
+    (UUIDS.PROBE1_TEMPERATURE, b"\x19\x00"),
+    (UUIDS.PROBE2_TEMPERATURE, b"\x30\xf8"),
+    (UUIDS.AMBIENT_TEMPERATURE, b"\xa5\x00"),
+    (UUIDS.HEATING_ELEMENTS, b"120 118 150 150"),
+    (UUIDS.BATTERY_LEVEL, b"\x55"),
+    (UUIDS.PROPANE_LEVEL, b"\x03"),
+]
+
+
+def test_temperature():
+    assert decode_temperature(b"\x19\x00") == (25.0,)
+    # Unplugged probe
+    assert decode_temperature(b"\x30\xf8") == (0,)
+
+
+def test_heating_elements():
+    assert decode_heating_elements(b"120 118 150 150") == (120.0, 118.0, 150.0, 150.0)
+    assert decode_heating_elements(bytearray(b" 120  118 150 150\r\n")) == (
+        120.0,
+        118.0,
+        150.0,
+        150.0,
+    )
+
+
+def test_heating_elements_extra_fields_ignored():
+    assert decode_heating_elements(b"120 118 150 150 1") == (120.0, 118.0, 150.0, 150.0)
+
+
+def test_heating_elements_too_short():
+    with pytest.raises(ValueError):
+        decode_heating_elements(b"120 118")
+
+
+@pytest.mark.parametrize(
+    "decode, payload",
+    [
+        (decode_temperature, b""),
+        (decode_temperature, b"\x19"),
+        (decode_battery, b""),
+        (decode_propane, b""),
+    ],
+)
+def test_short_payload(decode, payload):
+    with pytest.raises(ValueError):
+        decode(payload)
+
+
+def test_decode_captured(benchmark):
+    """Every captured payload through the registry, as the dispatch decodes them."""
+    payloads = [(DECODERS[uuid.lower()], payload) for uuid, payload in CAPTURED]
+
+    def decode_all():
+        for decoder, payload in payloads:
+            decoder.decode(payload)
+
+    benchmark(decode_all)
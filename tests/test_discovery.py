@@ -0,0 +1,37 @@
+"""Resolution of advertised local names to grill models."""
+import pytest
+
+from igrill_ble.const import SensorType
+from igrill_ble.discovery import PrefixIndex, get_device_type
+
+
+@pytest.mark.parametrize(
+    ("name", "sensor_type"),
+    [
+        ("iGrill_mini", SensorType.IGRILL_MINI),
+        ("iGrill_mini_2", SensorType.IGRILL_MINI_2),
+        ("iGrill_mini_2A1B2", SensorType.IGRILL_MINI_2),
+        ("iGrill_v2", SensorType.IGRILL_V2),
+        ("iGrill_v2_2", SensorType.IGRILL_V2_2),
+        ("iGrill_v2_2A1B2", SensorType.IGRILL_V2_2),
+        ("KT", SensorType.KITCHEN_THERMOMETER),
+        ("KT_mini", SensorType.KITCHEN_THERMOMETER_MINI),
+        ("KT_miniA1B2", SensorType.KITCHEN_THERMOMETER_MINI),
+        ("KT_m", SensorType.KITCHEN_THERMOMETER),
+    ],
+)
+def test_longest_prefix_wins(name, sensor_type):
+    assert get_device_type(name) is sensor_type
+
+
+@pytest.mark.parametrize("name", [None, "", "iGril", "Weber"])
+def test_unknown_name(name):
+    assert get_device_type(name) is None
+
+
+def test_prefix_order_does_not_matter():
+    longer_first = PrefixIndex({"igrill_mini_2": 2, "igrill_mini": 1})
+    shorter_first = PrefixIndex({"igrill_mini": 1, "igrill_mini_2": 2})
+    for index in (longer_first, shorter_first):
+        assert index.longest_prefix("igrill_mini_2") == 2
+        assert index.longest_prefix("igrill_mini_") == 1
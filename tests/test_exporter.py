@@ -0,0 +1,106 @@
+"""The line protocol exporter against a local TCP listener."""
+import asyncio
+import socket
+
+from igrill_ble.core import EntityKey
+from igrill_ble.exporter import Exporter, LineProtocolSink
+
+PROBE_1 = EntityKey("probe_1", None)
+
+
+class Listener:
+    """A line protocol socket listener, collecting the lines received."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.received = asyncio.Event()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def async_start(self, port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._client, "127.0.0.1", port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def _client(self, reader, writer) -> None:
+        while line := await reader.readline():
+            self.lines.append(line.decode().rstrip("\n"))
+            self.received.set()
+        writer.close()
+
+    async def async_wait(self, count: int) -> None:
+        while len(self.lines) < count:
+            self.received.clear()
+            await asyncio.wait_for(self.received.wait(), 1)
+
+    async def async_stop(self) -> None:
+        self._server.close()
+
+
+def _exporter(port: int, **kwargs) -> Exporter:
+    return Exporter(
+        LineProtocolSink("127.0.0.1", port), {"address": "70:91:8F:00:00:01"}, **kwargs
+    )
+
+
+def test_batches():
+    async def run():
+        listener = Listener()
+        port = await listener.async_start()
+        exporter = _exporter(port, batch_size=3, flush_interval=0.05)
+        for value in range(5):
+            exporter.async_values({PROBE_1: 20 + value})
+        exporter.async_start()
+        await listener.async_wait(5)
+        await exporter.async_stop()
+        await listener.async_stop()
+        return listener.lines, exporter.counters
+
+    lines, counters = asyncio.run(run())
+    assert [line.split(" ")[1] for line in lines] == [
+        f"probe_1={20.0 + value}" for value in range(5)
+    ]
+    assert lines[0].startswith(r"igrill,address=70:91:8F:00:00:01 ")
+    # Everything queued before starting fills a full batch, then the rest
+    assert counters["batches"] == 2
+    assert counters["lines"] == 5
+
+
+def test_overflow_drops_oldest():
+    async def run():
+        listener = Listener()
+        port = await listener.async_start()
+        exporter = _exporter(port, queue_size=2, flush_interval=0.01)
+        for value in range(3):
+            exporter.async_values({PROBE_1: value})
+        exporter.async_start()
+        await listener.async_wait(2)
+        await exporter.async_stop()
+        await listener.async_stop()
+        return listener.lines, exporter.counters
+
+    lines, counters = asyncio.run(run())
+    assert [line.split(" ")[1] for line in lines] == ["probe_1=1.0", "probe_1=2.0"]
+    assert counters["dropped"] == 1
+
+
+def test_retries_failed_send():
+    with socket.socket() as free:
+        free.bind(("127.0.0.1", 0))
+        port = free.getsockname()[1]
+
+    async def run():
+        # Nothing listens yet, the first sends are refused
+        exporter = _exporter(port, flush_interval=0.01)
+        exporter.async_values({PROBE_1: 25})
+        exporter.async_start()
+        while not exporter.counters["send_failures"]:
+            await asyncio.sleep(0.01)
+        listener = Listener()
+        await listener.async_start(port)
+        await listener.async_wait(1)
+        await exporter.async_stop()
+        await listener.async_stop()
+        return listener.lines, exporter.counters
+
+    lines, counters = asyncio.run(run())
+    assert [line.split(" ")[1] for line in lines] == ["probe_1=25.0"]
+    assert counters["batches"] == 1
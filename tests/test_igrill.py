@@ -0,0 +1,196 @@
+"""Authentication and value handling of IDevicePeripheral against the simulated grill."""
+import asyncio
+
+import pytest
+from bleak.exc import BleakError
+
+from igrill_ble.core import EntityKey
+from igrill_ble.igrill import DEVICE_TYPES, UUIDS, IGrillV2Peripheral
+from igrill_ble.simulator import FakeBleakClient
+
+
+class FirmwareBeforeAuthClient(FakeBleakClient):
+    """A grill that lets the firmware be read before authenticating."""
+
+    async def read_gatt_char(self, specifier, **kwargs):
+        uuid = self.simulator.resolve(specifier)
+        if uuid == UUIDS.FIRMWARE_VERSION.lower():
+            await self._async_operation()
+            return bytearray(self.simulator.values[uuid])
+        return await super().read_gatt_char(specifier, **kwargs)
+
+
+class DropsResumedSessionClient(FakeBleakClient):
+    """A grill that drops the link when read from before handshaking on it."""
+
+    handshaken = False
+
+    async def write_gatt_char(self, specifier, data, response: bool = False):
+        if self.simulator.resolve(specifier) == UUIDS.APP_CHALLENGE.lower():
+            self.handshaken = True
+        await super().write_gatt_char(specifier, data, response)
+
+    async def read_gatt_char(self, specifier, **kwargs):
+        if not self.handshaken:
+            self._drop()
+        return await super().read_gatt_char(specifier, **kwargs)
+
+
+def test_refused_subscribe_falls_back_to_full_handshake(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        # The grill forgets the session on every disconnect
+        simulator, device = simulate(peripheral, resume_sessions=False)
+        peripheral.client_class = type(
+            "Client", (FirmwareBeforeAuthClient,), {"simulator": simulator}
+        )
+        await peripheral.async_init(device)
+        await peripheral.async_disconnect()
+
+        # The resumed firmware read succeeds, the subscriptions are refused
+        with pytest.raises(BleakError):
+            await peripheral.async_init(device)
+        assert not peripheral.authenticated
+        await peripheral.async_disconnect()
+
+        await peripheral.async_init(device)
+        counters = peripheral.metrics.counters
+        assert counters["full_handshakes"] == 2
+        assert counters["resumed_sessions"] == 1
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_dropped_resume_falls_back_to_full_handshake(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        simulator, device = simulate(peripheral)
+        peripheral.client_class = type(
+            "Client", (DropsResumedSessionClient,), {"simulator": simulator}
+        )
+        await peripheral.async_init(device)
+        await peripheral.async_disconnect()
+
+        with pytest.raises(BleakError):
+            await peripheral.async_init(device)
+        assert not peripheral.authenticated
+
+        await peripheral.async_init(device)
+        counters = peripheral.metrics.counters
+        assert counters["full_handshakes"] == 2
+        assert counters["resumed_sessions"] == 0
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_unchanged_signal_strength_not_queued():
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        peripheral.async_add_values_listener(batches.append)
+        peripheral.update_rssi(-60.2)
+        peripheral.update_rssi(-59.8)
+        peripheral.update_rssi(-63.4)
+
+    batches = []
+    asyncio.run(run())
+    assert batches == [
+        {EntityKey("signal_strength", None): -60},
+        {EntityKey("signal_strength", None): -63},
+    ]
+
+
+@pytest.mark.parametrize("sensor_type", sorted(DEVICE_TYPES))
+def test_no_instance_dict(sensor_type):
+    assert not hasattr(DEVICE_TYPES[sensor_type](), "__dict__")
+
+
+def test_malformed_payload_keeps_rest_of_batch(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        simulator, device = simulate(peripheral)
+        await peripheral.async_init(device)
+        simulator.set_value(UUIDS.PROBE1_TEMPERATURE.lower(), b"\x19")
+        simulator.set_temperature(2, 30)
+        await asyncio.sleep(0.05)
+        assert peripheral.get_data(EntityKey("probe_2", None)) == 30
+        assert peripheral.metrics.counters["malformed_payloads"] == 1
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+class ClearsTargetPeripheral(IGrillV2Peripheral):
+    """Has probe 2's target cleared while probe 1's is written on connecting."""
+
+    async def _async_write_threshold(self, key):
+        await super()._async_write_threshold(key)
+        if key == "probe_1" and "probe_2" in self.thresholds:
+            await self.async_set_probe_threshold("probe_2", None)
+
+
+def test_target_cleared_while_subscribing(simulate):
+    async def run():
+        peripheral = ClearsTargetPeripheral()
+        simulator, device = simulate(peripheral)
+        await peripheral.async_set_probe_threshold("probe_1", 60)
+        await peripheral.async_set_probe_threshold("probe_2", 70)
+        await peripheral.async_init(device)
+        assert peripheral.thresholds == {"probe_1": 60}
+        assert simulator.values[UUIDS.PROBE2_THRESHOLD.lower()] == b"\x00\x00"
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_connect_writes_each_entity_once(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        simulator, device = simulate(peripheral)
+        simulator.set_temperature(1, 25)
+        received = []
+        peripheral.async_add_entity_listener(EntityKey("probe_1", None), received.append)
+        await peripheral.async_init(device)
+        assert received == [25]
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_flap_within_grace_writes_nothing(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        peripheral.availability_grace = 0.1
+        simulator, device = simulate(peripheral)
+        await peripheral.async_init(device)
+        received = []
+        for key in ("probe_1", "battery"):
+            peripheral.async_add_entity_listener(EntityKey(key, None), received.append)
+
+        peripheral.client._drop()
+        assert peripheral.available
+        await peripheral.async_init(device)
+        # Past the end of the grace window, which started with the drop
+        await asyncio.sleep(0.15)
+        assert received == []
+        counters = peripheral.metrics.counters
+        assert counters["became_unavailable"] == 0
+        await peripheral.close()
+
+    asyncio.run(run())
+
+
+def test_notification_latency_includes_dispatch_lag(simulate):
+    async def run():
+        peripheral = IGrillV2Peripheral()
+        simulator, device = simulate(peripheral)
+        await peripheral.async_init(device)
+        simulator.set_temperature(1, 30)
+        await asyncio.sleep(0.01)
+        metrics = peripheral.metrics
+        assert metrics.notification_latency.count == 1
+        assert metrics.notification_latency.last >= metrics.dispatch_lag.last
+        await peripheral.close()
+
+    asyncio.run(run())
@@ -0,0 +1,73 @@
+"""Rate limiting of the values published to entities."""
+import asyncio
+
+from igrill_ble.core import EntityKey
+from igrill_ble.throttle import PublishPolicy, PublishThrottle
+
+PROBE = EntityKey("probe_1", None)
+
+
+def test_deadband_suppresses_small_changes():
+    throttle = PublishThrottle(lambda key, value: None)
+    throttle.set_policy(PROBE.key, PublishPolicy(deadband=0.5))
+
+    assert throttle.should_publish(PROBE, 20.0)
+    assert not throttle.should_publish(PROBE, 20.0)
+    assert not throttle.should_publish(PROBE, 20.4)
+    # Measured from the last published value, not the last suppressed one
+    assert throttle.should_publish(PROBE, 20.5)
+    # Other keys are not held to the policy
+    assert throttle.should_publish(EntityKey("probe_2", None), 20.0)
+    assert throttle.should_publish(EntityKey("probe_2", None), 20.1)
+    assert (throttle.published, throttle.suppressed) == (4, 2)
+
+
+def test_min_interval_flushes_latest_value():
+    async def run():
+        published = []
+        throttle = PublishThrottle(lambda key, value: published.append(value))
+        throttle.set_policy(PROBE.key, PublishPolicy(min_interval=0.05))
+
+        assert throttle.should_publish(PROBE, 20.0)
+        # Deferred within the interval, only the latest is flushed once it ends
+        assert not throttle.should_publish(PROBE, 21.0)
+        assert not throttle.should_publish(PROBE, 22.0)
+        assert published == []
+        await asyncio.sleep(0.1)
+        assert published == [22.0]
+        assert (throttle.published, throttle.suppressed) == (2, 2)
+
+    asyncio.run(run())
+
+
+def test_min_interval_drops_value_returning_to_published():
+    async def run():
+        published = []
+        throttle = PublishThrottle(lambda key, value: published.append(value))
+        throttle.set_policy(PROBE.key, PublishPolicy(min_interval=0.05))
+
+        assert throttle.should_publish(PROBE, 20.0)
+        assert not throttle.should_publish(PROBE, 21.0)
+        # Back at the published value before the interval ends, nothing to flush
+        assert not throttle.should_publish(PROBE, 20.0)
+        await asyncio.sleep(0.1)
+        assert published == []
+        assert (throttle.published, throttle.suppressed) == (1, 2)
+
+    asyncio.run(run())
+
+
+def test_cancel_drops_pending_flush():
+    async def run():
+        published = []
+        throttle = PublishThrottle(lambda key, value: published.append(value))
+        throttle.set_policy(PROBE.key, PublishPolicy(min_interval=0.05))
+
+        assert throttle.should_publish(PROBE, 20.0)
+        assert not throttle.should_publish(PROBE, 21.0)
+        throttle.cancel()
+        await asyncio.sleep(0.1)
+        assert published == []
+        assert (throttle.published, throttle.suppressed) == (1, 1)
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+"""Writes through the coalescing WriteQueue against the simulated grill."""
+import asyncio
+
+import pytest
+
+from igrill_ble.igrill import UUIDS, IGrillV3Peripheral
+
+
+def test_close_cancels_inflight_write(simulate):
+    async def run():
+        peripheral = IGrillV3Peripheral()
+        _, device = simulate(peripheral, latency=0.05)
+        await peripheral.async_init(device)
+        write = asyncio.create_task(peripheral.set_led_state(True))
+        # Let the write reach the link before closing
+        await asyncio.sleep(0.01)
+        await peripheral.close()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(write, 1)
+
+    asyncio.run(run())
+
+
+
+def test_knob_light_toggled_from_last_state(simulate):
+    async def run():
+        peripheral = IGrillV3Peripheral()
+        simulator, device = simulate(peripheral, latency=0.01)
+        await peripheral.async_init(device)
+        writes = peripheral.metrics.counters["writes"]
+
+        await peripheral.set_led_state(True)
+        assert simulator.values[UUIDS.LED_KNOB_TOGGLE.lower()] == b"\x01"
+        # Already on, nothing to toggle
+        await peripheral.set_led_state(True)
+        assert peripheral.metrics.counters["writes"] == writes + 1
+
+        # Requested together, both toggles are sent rather than coalesced
+        await asyncio.gather(
+            peripheral.set_led_state(False), peripheral.set_led_state(True)
+        )
+        assert peripheral.metrics.counters["writes"] == writes + 3
+        assert peripheral.led_on is True
+        await peripheral.close()
+
+    asyncio.run(run())